@@ -0,0 +1,248 @@
+"""
+Benchmark of every simulator at growing workload sizes.
+Each run is a separate process started in its lab directory, labs have modules with the same names
+and peak memory of one run must not hide another. Workloads are generated from a fixed seed.
+
+python benchmark.py --sizes 1000 10000 100000 1000000 --output baseline.json
+python benchmark.py --compare baseline.json --threshold 0.2 --output current.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+
+try:
+    import resource
+except ImportError:
+    # not available on windows, peak memory is not measured there
+    resource = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SIZES = (1000, 10000, 100000, 1000000)
+SEED = 0
+REPEAT = 3
+TIMEOUT = 600
+THRESHOLD = 0.2
+# runs faster than this are too noisy to flag as slower
+MIN_WALL_TIME = 0.05
+OUTPUT_FILENAME = "benchmark.json"
+# share of real time requests in lista2 workloads
+REAL_TIME_SHARE = 0.1
+
+# lab directory -> algorithm -> method of lab Main
+ALGORITHMS = {
+    "lista1": {"FCFS": "runFCFS",
+               "SJF": "runSJF",
+               "RR": "runRR",
+               "MLFQ": "runMLFQ",
+               "CFS": "runCFS",
+               "MULTICORE": "runMulticore",
+               "FCFS-VECTORIZED": "runFCFSVectorized"},
+    "lista2": {"FCFS": "run_fcfs",
+               "SSTF": "run_sstf",
+               "SCAN": "run_scan",
+               "C-SCAN": "run_c_scan",
+               "C-LOOK": "run_c_look",
+               "SSTF-EDF": "run_sstf_edf",
+               "SSTF-FDF-SCAN": "run_sstf_fdf_scan",
+               "SPTF": "run_sptf",
+               "FCFS-VECTORIZED": "run_fcfs_vectorized",
+               "SCAN-VECTORIZED": "run_scan_vectorized",
+               "C-SCAN-VECTORIZED": "run_c_scan_vectorized",
+               "C-LOOK-VECTORIZED": "run_c_look_vectorized"},
+    "lista3": {"FIFO": "run_FIFO",
+               "OPT": "run_OPT",
+               "LRU": "run_LRU",
+               "SC": "run_SC",
+               "RAND": "run_RAND"},
+    "lista4": {"EQUAL": "run_equal_allocation",
+               "PROPORTIONAL": "run_proportional_allocation",
+               "FAULT-FREQUENCY": "run_dynamic_fault_frequency",
+               "ZONE": "run_dynamic_zone"},
+}
+
+
+def create_main(lab, size, seed, algorithm):
+    """Returns Main of the lab with size records generated from seed for algorithm,
+    lab directory must be current directory."""
+    sys.path.insert(0, os.getcwd())
+    if lab == "lista1":
+        import Main as lab_main
+        main = lab_main.Main()
+        main.create_processes(size, seed=seed)
+        return main
+
+    import main as lab_main
+    if lab == "lista2":
+        # arrivals stay as dense as in the default workload, vectorized evaluators get static batches
+        # because requests arriving after start make them fall back to step by step runs
+        max_arrive_time = size * lab_main.MAX_ARRIVE_TIME // lab_main.REQUESTS_COUNT
+        if algorithm.endswith("-VECTORIZED"):
+            max_arrive_time = 0
+        main = lab_main.Main()
+        main.create_requests(seed, requests_count=size, real_time_count=int(size * REAL_TIME_SHARE),
+                             max_arrive_time=max_arrive_time)
+    elif lab == "lista3":
+        main = lab_main.Main()
+        main.create_requests(seed, requests_count=size)
+    else:
+        main = lab_main.Main()
+        main.create_processes(seed, requests_count=max(1, size // lab_main.PROCESS_COUNT))
+    return main
+
+
+def run_once(lab, algorithm, size, seed, repeat) -> dict:
+    """Runs algorithm repeat times on one workload, the fastest run counts."""
+    logging.disable(logging.CRITICAL)
+    main = create_main(lab, size, seed, algorithm)
+    method = getattr(main, ALGORITHMS[lab][algorithm])
+
+    wall_time = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = method()
+        if hasattr(result, "join"):
+            # lista2 algorithms run in threads
+            result = result.join()
+            if result["exit_code"] != 0:
+                raise result["result"]
+        elapsed = time.perf_counter() - start
+        wall_time = elapsed if wall_time is None else min(wall_time, elapsed)
+
+    peak_rss = None
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_rss = peak_rss // 1024
+    return {"status": "ok",
+            "wall_time": round(wall_time, 6),
+            "peak_rss_kb": peak_rss,
+            "ops_per_sec": round(size / wall_time, 2) if wall_time > 0 else None}
+
+
+def run_benchmarks(labs, sizes, seed=SEED, repeat=REPEAT, timeout=TIMEOUT, algorithms=None) -> dict:
+    """Runs algorithms of labs at every size, larger sizes are skipped once an algorithm fails.
+    All algorithms of labs run when algorithms are not given."""
+    logger = logging.getLogger("BENCHMARK")
+    results = {}
+    for lab in labs:
+        for algorithm in ALGORITHMS[lab]:
+            if algorithms is not None and algorithm not in algorithms:
+                continue
+            failed = None
+            for size in sorted(sizes):
+                key = "{}/{}/{}".format(lab, algorithm, size)
+                if failed is not None:
+                    results[key] = {"status": "skipped"}
+                    continue
+                command = [sys.executable, os.path.abspath(__file__), "--run", lab, algorithm, str(size),
+                           "--seed", str(seed), "--repeat", str(repeat)]
+                try:
+                    process = subprocess.run(command, cwd=os.path.join(ROOT, lab), capture_output=True,
+                                             text=True, timeout=timeout, check=True)
+                    result = json.loads(process.stdout.splitlines()[-1])
+                except subprocess.TimeoutExpired:
+                    result = {"status": "timeout"}
+                except subprocess.CalledProcessError as error:
+                    result = {"status": "error"}
+                    logger.error("{} failed:\n{}".format(key, error.stderr.strip()))
+                if result["status"] != "ok":
+                    failed = result["status"]
+                results[key] = result
+                logger.info("{}: {}".format(key, describe(result)))
+    return results
+
+
+def describe(result) -> str:
+    if result["status"] != "ok":
+        return result["status"]
+    return "{:.3f} s, {} ops/s, peak RSS {} kB".format(result["wall_time"], result["ops_per_sec"],
+                                                       result["peak_rss_kb"])
+
+
+def compare(baseline, results, threshold=THRESHOLD) -> list:
+    """Returns descriptions of runs slower or bigger than in baseline by more than threshold,
+    runs which finished in baseline and do not finish now are regressions too."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline["results"].get(key)
+        if base is None or base["status"] != "ok":
+            continue
+        if result["status"] != "ok":
+            regressions.append("{}: {} (baseline {:.3f} s)".format(key, result["status"], base["wall_time"]))
+            continue
+        for metric in ("wall_time", "peak_rss_kb"):
+            if base[metric] is None or result[metric] is None or base[metric] == 0:
+                continue
+            if metric == "wall_time" and result[metric] < MIN_WALL_TIME:
+                continue
+            change = result[metric] / base[metric] - 1
+            if change > threshold:
+                regressions.append("{}: {} {} -> {} (+{:.0%})".format(key, metric, base[metric], result[metric],
+                                                                     change))
+    return regressions
+
+
+def save_results(results, filename, seed, repeat) -> None:
+    with open(filename, "w") as file:
+        json.dump({"python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "seed": seed,
+                   "repeat": repeat,
+                   "results": results}, file, indent=2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure wall time, peak memory and throughput of simulators.")
+    parser.add_argument("--labs", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--algorithms", nargs="+", default=None,
+                        help="run only these algorithms, for example FCFS SSTF")
+    parser.add_argument("--sizes", nargs="+", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds allowed for one run")
+    parser.add_argument("--output", default=OUTPUT_FILENAME)
+    parser.add_argument("--compare", default=None, help="baseline json, exits with 1 when a run regressed")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed relative slowdown")
+    parser.add_argument("--run", nargs=3, metavar=("LAB", "ALGORITHM", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run_lab, run_algorithm, run_size = args.run
+        print(json.dumps(run_once(run_lab, run_algorithm, int(run_size),
+                                  SEED if args.seed is None else args.seed,
+                                  REPEAT if args.repeat is None else args.repeat)))
+        sys.exit(0)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s %(message)s")
+    logger = logging.getLogger("BENCHMARK")
+
+    # comparison reuses sizes, seed and repeat of the baseline unless given
+    baseline_results = None
+    defaults = {"sizes": list(SIZES), "seed": SEED, "repeat": REPEAT}
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            baseline_results = json.load(baseline_file)
+        defaults["sizes"] = sorted({int(key.rsplit("/", 1)[1]) for key in baseline_results["results"]})
+        defaults["seed"] = baseline_results["seed"]
+        defaults["repeat"] = baseline_results["repeat"]
+    sizes = args.sizes or defaults["sizes"]
+    seed = defaults["seed"] if args.seed is None else args.seed
+    repeat = defaults["repeat"] if args.repeat is None else args.repeat
+
+    benchmark_results = run_benchmarks(args.labs, sizes, seed, repeat, args.timeout, args.algorithms)
+    save_results(benchmark_results, args.output, seed, repeat)
+    logger.info("Results saved to {}".format(args.output))
+
+    if baseline_results is not None:
+        found = compare(baseline_results, benchmark_results, args.threshold)
+        for regression in found:
+            logger.warning("Regression {}".format(regression))
+        logger.info("{} regressions over {:.0%} against {}".format(len(found), args.threshold, args.compare))
+        sys.exit(1 if found else 0)
@@ -0,0 +1,35 @@
+"""
+Arrivals of a workload sorted by arrive time, shared by all simulators.
+"""
+
+
+class ArrivalFeeder:
+    """Hands out indexes of workload items once their arrive time has come.
+
+    Items must be sorted by arrive time, the feeder only moves a cursor over them,
+    so all arrivals of a run take linear time no matter how often they are checked."""
+
+    def __init__(self, items):
+        super(ArrivalFeeder, self).__init__()
+        self.items = items
+        self.cursor = 0
+
+    def __len__(self):
+        """Returns number of items which did not arrive yet."""
+        return len(self.items) - self.cursor
+
+    def pop_arrived(self, now):
+        """Yields indexes of items arrived until now in arrival order."""
+        items = self.items
+        while self.cursor < len(items) and items[self.cursor].arrive_time <= now:
+            index = self.cursor
+            if index > 0 and items[index - 1].arrive_time > items[index].arrive_time:
+                raise ValueError("Workload is not sorted by arrive time at item {}".format(index))
+            self.cursor = index + 1
+            yield index
+
+    def next_arrival_time(self):
+        """Returns arrive time of the next item, None when every item arrived."""
+        if self.cursor < len(self.items):
+            return self.items[self.cursor].arrive_time
+        return None
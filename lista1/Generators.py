@@ -0,0 +1,53 @@
+"""
+Seeded workload generators.
+Processes are produced in arrival order, in chunks, without building the whole workload.
+Same seed and chunk size always give the same processes.
+"""
+
+import math
+import numpy as np
+
+from Process import Process
+from Utils import truncated_gauss
+
+CHUNK_SIZE = 65536
+
+
+def arrival_slot_counts(rng, count, bottom, top, distribution="uniform", mu=0, sigma=1):
+    """Draws how many processes arrive at every time from bottom to top."""
+    slots = np.arange(bottom, top + 1)
+    if distribution == "uniform":
+        probabilities = np.full(len(slots), 1 / len(slots))
+    elif distribution == "gauss":
+        # rounded sample lands in slot t when it falls into [t - 0.5, t + 0.5) clipped to [bottom, top]
+        edges = np.clip(np.append(slots - 0.5, top + 0.5), bottom, top)
+        cdf = np.array([0.5 * (1 + math.erf((edge - mu) / (sigma * math.sqrt(2)))) for edge in edges.tolist()])
+        probabilities = np.diff(cdf)
+        probabilities = probabilities / probabilities.sum()
+    else:
+        raise ValueError("Unknown distribution {}".format(distribution))
+    return rng.multinomial(count, probabilities)
+
+
+def generate_processes(count, min_length, max_length, min_arrive_time=0, max_arrive_time=1000,
+                       distribution="uniform", seed=None, chunk_size=CHUNK_SIZE):
+    """Yields lists of processes sorted by arrive time, ids follow arrival order.
+
+    With gauss distribution arrive times and lengths are drawn from normal distributions
+    centered between the bounds, with sigma of a quarter of the range."""
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(arrival_slot_counts(rng, count, min_arrive_time, max_arrive_time, distribution,
+                                             (min_arrive_time + max_arrive_time) / 2,
+                                             (max_arrive_time - min_arrive_time) / 4))
+
+    for start in range(0, count, chunk_size):
+        index = np.arange(start, min(start + chunk_size, count))
+        # process with index i arrives in the first slot whose cumulative count exceeds i
+        arrive_times = np.searchsorted(arrivals, index, side="right") + min_arrive_time
+        if distribution == "uniform":
+            durations = rng.integers(min_length, max_length + 1, len(index))
+        else:
+            durations = np.rint(truncated_gauss(rng, (min_length + max_length) / 2, (max_length - min_length) / 4,
+                                                min_length, max_length, len(index))).astype(np.int64)
+        yield [Process(process_id, arrive_time, duration) for process_id, arrive_time, duration
+               in zip(index.tolist(), arrive_times.tolist(), durations.tolist())]
@@ -2,41 +2,86 @@
 https://stackoverflow.com/questions/8097408/why-python-is-so-slow-for-a-simple-for-loop
 """
 
-import copy
+import heapq
 import pickle
-import random
 import logging
-import operator
+import itertools
 import collections
 
-from Process import Process
+import numpy as np
+
+from Records import ProcessRecords, write_records
+from Generators import generate_processes
 from Utils import OutputLogger
+from Process import ProcessState
+from Arrivals import ArrivalFeeder
+from Metrics import Histogram
+from Trace import TraceRecorder, FINISHED, PREEMPTED
+from Workload import Workload
+from Starvation import StarvationIndex
+from Multicore import MulticoreScheduler
 
 PROCESSES_FILENAME = "procs_data.txt"
+PROCESSES_BINARY_FILENAME = "procs_data.bin"
 PROCESS_COUNT = 5000
 PROCESS_SWITCH_DELAY = 1
 RR_QUANTUM_TIME = 30
 MIN_PROCESS_LENGTH = 5
 MAX_PROCESS_LENGTH = 21
 STARVATION_THRESHOLD = 80000
+# time quant of every MLFQ level, from the highest priority
+MLFQ_QUANTUM_TIMES = (8, 16, 32)
+MLFQ_BOOST_PERIOD = 2000
+CFS_SCHED_LATENCY = 48
+CFS_MIN_GRANULARITY = 6
+CORE_COUNT = 4
+# steal, migrate or none
+CORE_BALANCING = "steal"
+MIGRATION_COST = 2
+BALANCE_PERIOD = 100
+# weight of nice levels from -20 to 19, same as in linux kernel
+CFS_NICE_0_WEIGHT = 1024
+CFS_WEIGHTS = (88761, 71755, 56483, 46273, 36291,
+               29154, 23254, 18705, 14949, 11916,
+               9548, 7620, 6100, 4904, 3906,
+               3121, 2501, 1991, 1586, 1277,
+               1024, 820, 655, 526, 423,
+               335, 272, 215, 172, 137,
+               110, 87, 70, 56, 45,
+               36, 29, 23, 18, 15)
 
 # zagłodzenie - starvation
 
 
 class Main:
-    def __init__(self):
+    def __init__(self, switch_delay=PROCESS_SWITCH_DELAY, quantum=RR_QUANTUM_TIME,
+                 starvation_threshold=STARVATION_THRESHOLD, mlfq_quantums=MLFQ_QUANTUM_TIMES,
+                 boost_period=MLFQ_BOOST_PERIOD, sched_latency=CFS_SCHED_LATENCY,
+                 min_granularity=CFS_MIN_GRANULARITY, cores=CORE_COUNT, balancing=CORE_BALANCING,
+                 migration_cost=MIGRATION_COST, balance_period=BALANCE_PERIOD, trace_filename=None, trace_every=1,
+                 trace_window=None):
         super(Main, self).__init__()
         self.que = []
-
-    def create_processes(self, count):
-        for x in range(count):
-            # self.que.append(
-            #     Process(x, round(gauss_distribution(100, 50, 0, 1000)),
-            #             round(gauss_distribution(100, 50, 5, 25))))
-            self.que.append(
-                Process(x, random.randint(0, 1000),
-                        random.randint(MIN_PROCESS_LENGTH, MAX_PROCESS_LENGTH)))
-        self.que.sort(key=lambda proc: proc.arrive_time)
+        self.switch_delay = switch_delay
+        self.quantum = quantum
+        self.starvation_threshold = starvation_threshold
+        self.mlfq_quantums = mlfq_quantums
+        self.boost_period = boost_period
+        self.sched_latency = sched_latency
+        self.min_granularity = min_granularity
+        self.cores = cores
+        self.balancing = balancing
+        self.migration_cost = migration_cost
+        self.balance_period = balance_period
+        # schedule of FCFS, SJF and RR is traced when file name is given, {} is replaced by algorithm name
+        self.trace_filename = trace_filename
+        self.trace_every = trace_every
+        self.trace_window = trace_window
+
+    def create_processes(self, count, seed=None, distribution="uniform"):
+        for chunk in generate_processes(count, MIN_PROCESS_LENGTH, MAX_PROCESS_LENGTH,
+                                        distribution=distribution, seed=seed):
+            self.que.extend(chunk)
 
     def save_processes_to_file(self):
         with open(PROCESSES_FILENAME, "wb") as file:
@@ -46,158 +91,555 @@ class Main:
         with open(PROCESSES_FILENAME, "rb") as file:
             self.que = pickle.load(file)
 
+    def save_processes_to_binary(self):
+        write_records(PROCESSES_BINARY_FILENAME, self.que, {"count": len(self.que),
+                                                            "min_length": MIN_PROCESS_LENGTH,
+                                                            "max_length": MAX_PROCESS_LENGTH})
+
+    def load_processes_from_binary(self):
+        self.que = ProcessRecords(PROCESSES_BINARY_FILENAME)
+
+    def stream_processes_to_binary(self, count, seed=None, distribution="uniform"):
+        """Generates processes straight to binary file, only one chunk is kept in memory."""
+        write_records(PROCESSES_BINARY_FILENAME,
+                      itertools.chain.from_iterable(generate_processes(count, MIN_PROCESS_LENGTH, MAX_PROCESS_LENGTH,
+                                                                       distribution=distribution, seed=seed)),
+                      {"count": count,
+                       "min_length": MIN_PROCESS_LENGTH,
+                       "max_length": MAX_PROCESS_LENGTH,
+                       "distribution": distribution,
+                       "seed": seed})
+
+    def open_trace(self, algorithm):
+        """Returns trace recorder for run of algorithm or None when tracing is disabled."""
+        if self.trace_filename is None:
+            return None
+        return TraceRecorder(self.trace_filename.format(algorithm), {"algorithm": algorithm,
+                                                                     "switch_delay": self.switch_delay,
+                                                                     "quantum": self.quantum},
+                             every=self.trace_every, window=self.trace_window)
+
     def runFCFS(self):
         logger = logging.getLogger("FCFS")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = self.que
+        state = ProcessState(incomming)
+        time_waiting = state.time_waiting
+        arrivals = ArrivalFeeder(incomming)
+        waiting_times = Histogram()
         starved_processes = collections.deque()
+        # ready queue holds (admission time, process index) pairs
         queue = collections.deque()
+        trace = self.open_trace("FCFS")
         time = 0
 
-        while True:
+        while len(arrivals) != 0 or len(queue) != 0:
+            if len(queue) == 0 and arrivals.next_arrival_time() > time:
+                # cpu is idle, jump straight to the next arrival
+                time = arrivals.next_arrival_time()
+
             # check for new processes
-            for process in list(incomming):
-                if process.arrive_time <= time:
-                    queue.append(process)
-                    incomming.remove(process)
+            for index in arrivals.pop_arrived(time):
+                queue.append((time, index))
 
-            if len(queue) != 0:
-                process = queue.popleft()
-                process.set_time_left(0)
-                completed.append(process)
-
-                for other in list(queue):
-                    if other.time_waiting >= STARVATION_THRESHOLD:
-                        starved_processes.append(other)
-                        queue.remove(other)
-                    else:
-                        other.set_wait_time(other.time_waiting + process.duration)
-
-                time = time + process.duration
-            if len(incomming) == 0 and len(queue) == 0:
-                break
+            admitted, index = queue.popleft()
+            state.time_left[index] = 0
+            time_waiting[index] = time - admitted
+            waiting_times.record(time_waiting[index], index)
+
+            # admission times never decrease, so starved processes are always at the front
+            while len(queue) != 0 and time - queue[0][0] >= self.starvation_threshold:
+                starved_processes.append(queue.popleft()[1])
 
-        longest_waiting = max(completed, key=operator.attrgetter("time_waiting"))
+            time = time + incomming[index].duration
+
+        if trace is not None:
+            self.trace_fcfs(trace, starved_processes)
+            trace.close()
+        longest_waiting = waiting_times.max_item
+        average_waiting = round(waiting_times.mean(), 2)
         logger.info("================= FCFS =================")
         logger.info("Total starved processes: {}".format(len(starved_processes)))
-        logger.info("Average waiting time: {}".format(round(sum(proc.time_waiting for proc in completed) /
-                                                            len(completed), 2)))
-        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(longest_waiting.time_waiting,
-                                                                                 longest_waiting.duration,
-                                                                                 longest_waiting.arrive_time))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            incomming[longest_waiting].duration,
+            incomming[longest_waiting].arrive_time))
+        return {"algorithm": "FCFS",
+                "starved": len(starved_processes),
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles()}
+
+    def trace_fcfs(self, trace, starved_processes):
+        """FCFS runs processes which did not starve in arrival order, each one starts when the previous one
+        finished or when it arrived, so the schedule is traced from columns after the run, not in its loop."""
+        workload = self.load_workload()
+        if len(starved_processes) != 0:
+            ran = np.ones(len(workload), dtype=bool)
+            ran[np.fromiter(starved_processes, dtype=np.int64, count=len(starved_processes))] = False
+            workload = Workload(workload.id[ran], workload.arrive_time[ran], workload.duration[ran])
+        start = workload.fcfs_start()
+        trace.record_columns(workload.id, start, start + workload.duration, FINISHED)
+
+    def load_workload(self):
+        if isinstance(self.que, ProcessRecords):
+            return Workload.from_records(self.que)
+        return Workload.from_processes(self.que)
+
+    def runFCFSVectorized(self):
+        logger = logging.getLogger("FCFS")
+        workload = self.load_workload()
+        if not workload.evaluate_fcfs(self.starvation_threshold):
+            logger.info("Processes starve, falling back to step by step FCFS")
+            return self.runFCFS()
+
+        waiting_times = Histogram()
+        for value, count in zip(*np.unique(workload.time_waiting, return_counts=True)):
+            waiting_times.record(int(value), count=int(count))
+        longest_waiting = int(workload.time_waiting.argmax())
+        average_waiting = round(int(workload.time_waiting.sum()) / len(workload), 2)
+        logger.info("================= FCFS =================")
+        logger.info("Total starved processes: {}".format(0))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            int(workload.time_waiting[longest_waiting]),
+            int(workload.duration[longest_waiting]),
+            int(workload.arrive_time[longest_waiting])))
+        return {"algorithm": "FCFS",
+                "starved": 0,
+                "average_waiting": average_waiting,
+                "longest_waiting": int(workload.time_waiting[longest_waiting]),
+                "waiting_percentiles": waiting_times.percentiles()}
 
     def runSJF(self):
         logger = logging.getLogger("SJF")
         time = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
+        incomming = self.que
+        state = ProcessState(incomming)
+        time_left = state.time_left
+        time_waiting = state.time_waiting
+        arrivals = ArrivalFeeder(incomming)
+        # ready heap entries: (time left, -last run tick, arrival order, waiting entry of process index)
+        # ties on time left go to the most recently run process, then to the earliest arrival
+        # entries of starved processes stay in the heap until they reach its top
+        queue = []
+        waiting = StarvationIndex()
+        waiting_times = Histogram()
         starved_processes = collections.deque()
         total_switch_time = 0
         previous_process_id = None
-
-        while True:
-            for proc in list(incomming):
-                if proc.arrive_time <= time:
-                    queue.append(proc)
-                    incomming.remove(proc)
-                else:
-                    proc.set_wait_time(time)
-
+        running = None
+        run_start = 0
+        trace = self.open_trace("SJF")
+
+        while len(arrivals) != 0 or len(queue) > 0 or running is not None:
+            if running is None and len(queue) == 0 and arrivals.next_arrival_time() > time:
+                # cpu is idle, jump straight to the next arrival
+                time = arrivals.next_arrival_time()
+
+            entered = []
+            for index in arrivals.pop_arrived(time):
+                arrive_time = incomming[index].arrive_time
+                # waiting process was stamped with the previous tick every tick before it arrived
+                if arrive_time > 0:
+                    time_waiting[index] = arrive_time - 1
+                entry = waiting.add(time, index)
+                entered.append(entry)
+                heapq.heappush(queue, (time_left[index], 1, index, entry))
+
+            if running is not None and len(queue) > 0 and queue[0][0] < time_left[running]:
+                # preempted process ran on the previous tick
+                entry = waiting.add(time, running)
+                entered.append(entry)
+                heapq.heappush(queue, (time_left[running], 1 - time, running, entry))
+                if trace is not None:
+                    trace.record(incomming[running].id, run_start, time, PREEMPTED)
+                running = None
+
+            if running is None:
+                entry = heapq.heappop(queue)[3]
+                waiting.discard(entry)
+                running = entry.process
+                run_start = time
+                if entry.since < time:
+                    time_waiting[running] = time
+
+                process_id = incomming[running].id
+                if previous_process_id and previous_process_id != process_id:
+                    total_switch_time = total_switch_time + self.switch_delay
+                previous_process_id = process_id
+
+            if time >= self.starvation_threshold and len(waiting) > 0:
+                # every process that waited on the previous tick is stamped past the threshold
+                starved_processes.extend(waiting.expire(time - 1))
+                for entry in entered:
+                    if entry.waiting and time_waiting[entry.process] >= self.starvation_threshold:
+                        waiting.discard(entry)
+                        starved_processes.append(entry.process)
+
+            while len(queue) > 0 and not queue[0][3].waiting:
+                heapq.heappop(queue)
+
+            # run until completion, next arrival or next starvation check
+            ticks = max(time_left[running], 1)
+            if len(arrivals) != 0:
+                ticks = min(ticks, arrivals.next_arrival_time() - time)
             if len(queue) > 0:
-                shortest: Process = min(queue, key=operator.attrgetter("time_left"))
-                shortest.set_time_left(shortest.time_left - 1)
-                # print([x.time_left for x in queue])
-                queue.remove(shortest)
-
-                # sorting gives same result but real computing time is higher
-                # queue = collections.deque(sorted(queue, key=operator.attrgetter("time_left")))
-                # shortest: Process = queue.popleft()
-                # shortest.set_time_left(shortest.time_left - 1)
-
-                for proc in list(queue):
-                    if proc.time_waiting >= STARVATION_THRESHOLD:
-                        starved_processes.append(proc)
-                        queue.remove(proc)
-                    else:
-                        proc.set_wait_time(time + 1)
-
-                if shortest.time_left > 0:
-                    queue.insert(0, shortest)
-                else:
-                    completed.append(shortest)
-
-                if previous_process_id and previous_process_id != shortest.id:
-                    total_switch_time = total_switch_time + PROCESS_SWITCH_DELAY
-                previous_process_id = shortest.id
-
-            time = time + 1
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("time_waiting"))
+                ticks = min(ticks, max(self.starvation_threshold - time, 1))
+
+            time_left[running] = time_left[running] - ticks
+            time = time + ticks
+            if time_left[running] <= 0:
+                waiting_times.record(time_waiting[running], running)
+                if trace is not None:
+                    trace.record(incomming[running].id, run_start, time, FINISHED)
+                running = None
+
+        if trace is not None:
+            trace.close()
+        longest_waiting = waiting_times.max_item
+        average_waiting = waiting_times.mean()
         logger.info("================= SJF =================")
-        logger.info("Switch delay was {}".format(PROCESS_SWITCH_DELAY))
+        logger.info("Switch delay was {}".format(self.switch_delay))
         logger.info("Total starved processes: {}".format(len(starved_processes)))
         logger.info("Time wasted for switching: {}".format(round(total_switch_time, 2)))
-        logger.info("Average waiting time: {}".format(sum(proc.time_waiting for proc in completed) / len(completed)))
-        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(longest_waiting.time_waiting,
-                                                                                 longest_waiting.duration,
-                                                                                 longest_waiting.arrive_time))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            incomming[longest_waiting].duration,
+            incomming[longest_waiting].arrive_time))
+        return {"algorithm": "SJF",
+                "starved": len(starved_processes),
+                "switch_time": round(total_switch_time, 2),
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles()}
 
     def runRR(self):
         logger = logging.getLogger("RR")
         time = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
+        processes = self.que
+        state = ProcessState(processes)
+        time_left = state.time_left
+        time_waiting = state.time_waiting
+        arrivals = ArrivalFeeder(processes)
+        # queue holds waiting entries of process indexes, process waited for every delta dispatched since entry.since
         queue = collections.deque()
-        completed = collections.deque()
+        waiting = StarvationIndex()
+        total_delta = 0
+        waiting_times = Histogram()
         starved_processes = collections.deque()
         total_switch_time = 0
+        trace = self.open_trace("RR")
 
         while True:
+            if len(waiting) == 0 and len(arrivals) != 0:
+                # cpu is idle, jump straight to the next arrival
+                time = max(time, arrivals.next_arrival_time())
+
             # check for new processes
-            for process in list(incomming):
-                if process.arrive_time <= time:
-                    queue.append(process)
-                    incomming.remove(process)
+            for index in arrivals.pop_arrived(time):
+                queue.append(waiting.add(total_delta - time_waiting[index], index))
+
+            # drop entries of starved processes
+            while len(queue) != 0 and not queue[0].waiting:
+                queue.popleft()
 
             if len(queue) != 0:
-                process = queue.popleft()
-                time_delta = process.time_left - RR_QUANTUM_TIME
+                entry = queue.popleft()
+                waiting.discard(entry)
+                index = entry.process
+                time_waiting[index] = total_delta - entry.since
+                time_delta = time_left[index] - self.quantum
                 if time_delta <= 0:
-                    process.set_time_left(0)
-                    completed.append(process)
-                    time_delta = process.duration - process.time_left
+                    time_left[index] = 0
+                    waiting_times.record(time_waiting[index], index)
+                    time_delta = processes[index].duration - time_left[index]
                 else:
-                    process.set_time_left(time_delta)
+                    time_left[index] = time_delta
 
-                for other in list(queue):
-                    if other.time_waiting >= STARVATION_THRESHOLD:
-                        starved_processes.append(other)
-                        queue.remove(other)
-                    else:
-                        other.set_wait_time(other.time_waiting + time_delta)
+                starved_processes.extend(waiting.expire(total_delta - self.starvation_threshold))
+                total_delta = total_delta + time_delta
 
-                if process.time_left != 0:
-                    queue.append(process)
+                if time_left[index] != 0:
+                    queue.append(waiting.add(total_delta - time_waiting[index], index))
 
-                time = time + time_delta + PROCESS_SWITCH_DELAY
-                total_switch_time = total_switch_time + PROCESS_SWITCH_DELAY
-            if len(incomming) == 0 and len(queue) == 0:
+                if trace is not None:
+                    trace.record(processes[index].id, time, time + time_delta,
+                                 FINISHED if time_left[index] == 0 else PREEMPTED)
+                time = time + time_delta + self.switch_delay
+                total_switch_time = total_switch_time + self.switch_delay
+            if len(arrivals) == 0 and len(waiting) == 0:
                 break
 
-        longest_waiting = max(completed, key=operator.attrgetter("time_waiting"))
+        if trace is not None:
+            trace.close()
+        longest_waiting = waiting_times.max_item
+        average_waiting = round(waiting_times.mean(), 2)
         logger.info("================= RR =================")
         logger.info("Time quant was {} ({}% of maximum process length).".format(
-            RR_QUANTUM_TIME, round(100 * RR_QUANTUM_TIME/MAX_PROCESS_LENGTH)))
-        logger.info("Switch delay was {}".format(PROCESS_SWITCH_DELAY))
+            self.quantum, round(100 * self.quantum/MAX_PROCESS_LENGTH)))
+        logger.info("Switch delay was {}".format(self.switch_delay))
+        logger.info("Total starved processes: {}".format(len(starved_processes)))
+        logger.info("Time wasted for switching: {}".format(round(total_switch_time, 2)))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            processes[longest_waiting].duration,
+            processes[longest_waiting].arrive_time))
+        return {"algorithm": "RR",
+                "starved": len(starved_processes),
+                "switch_time": round(total_switch_time, 2),
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles()}
+
+    def runMLFQ(self):
+        logger = logging.getLogger("MLFQ")
+        time = 0
+        incomming = self.que
+        state = ProcessState(incomming)
+        time_left = state.time_left
+        time_waiting = state.time_waiting
+        arrivals = ArrivalFeeder(incomming)
+        # one queue of waiting entries of process indexes per level
+        # bit i of bitmap is set when queue i may be non empty
+        queues = [collections.deque() for _ in self.mlfq_quantums]
+        bitmap = 0
+        # queues moved to the highest level by a boost, served before newer entries of the highest level
+        boosted = collections.deque()
+        next_boost = self.boost_period
+        waiting = StarvationIndex()
+        waiting_times = Histogram()
+        starved_processes = collections.deque()
+        total_switch_time = 0
+
+        while len(arrivals) != 0 or len(waiting) != 0:
+            if len(waiting) == 0 and arrivals.next_arrival_time() > time:
+                # cpu is idle, jump straight to the next arrival
+                time = arrivals.next_arrival_time()
+
+            # check for new processes, they wait since their arrival
+            for index in arrivals.pop_arrived(time):
+                queues[0].append(waiting.add(incomming[index].arrive_time, index))
+                bitmap = bitmap | 1
+
+            if time >= next_boost:
+                # move every queue to the highest level without touching its processes
+                for level in range(len(queues)):
+                    if len(queues[level]) != 0:
+                        boosted.append(queues[level])
+                        queues[level] = collections.deque()
+                bitmap = 1 if len(boosted) != 0 else 0
+                next_boost = (time // self.boost_period + 1) * self.boost_period
+
+            starved_processes.extend(waiting.expire(time - self.starvation_threshold))
+            if len(waiting) == 0:
+                continue
+
+            # lowest set bit is the highest non empty level, skip entries of starved processes
+            while True:
+                level = (bitmap & -bitmap).bit_length() - 1
+                ready = boosted[0] if level == 0 and len(boosted) != 0 else queues[level]
+                entry = ready.popleft()
+                if len(ready) == 0:
+                    if level == 0 and len(boosted) != 0:
+                        boosted.popleft()
+                    if level != 0 or (len(boosted) == 0 and len(queues[0]) == 0):
+                        bitmap = bitmap & ~(1 << level)
+                if entry.waiting:
+                    break
+
+            waiting.discard(entry)
+            index = entry.process
+            time_waiting[index] = time - entry.since
+            time_delta = min(time_left[index], self.mlfq_quantums[level])
+            time_left[index] = time_left[index] - time_delta
+            time = time + time_delta
+
+            if time_left[index] == 0:
+                waiting_times.record(time_waiting[index], index)
+            else:
+                # process used its whole quant, move it one level down
+                level = min(level + 1, len(queues) - 1)
+                queues[level].append(waiting.add(time - time_waiting[index], index))
+                bitmap = bitmap | (1 << level)
+
+            time = time + self.switch_delay
+            total_switch_time = total_switch_time + self.switch_delay
+
+        longest_waiting = waiting_times.max_item
+        average_waiting = round(waiting_times.mean(), 2)
+        logger.info("================= MLFQ =================")
+        logger.info("Time quants of levels were {}, boost period was {}.".format(
+            ", ".join(str(quantum) for quantum in self.mlfq_quantums), self.boost_period))
+        logger.info("Switch delay was {}".format(self.switch_delay))
+        logger.info("Total starved processes: {}".format(len(starved_processes)))
+        logger.info("Time wasted for switching: {}".format(round(total_switch_time, 2)))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            incomming[longest_waiting].duration,
+            incomming[longest_waiting].arrive_time))
+        return {"algorithm": "MLFQ",
+                "starved": len(starved_processes),
+                "switch_time": round(total_switch_time, 2),
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles()}
+
+    def runCFS(self):
+        logger = logging.getLogger("CFS")
+        time = 0
+        incomming = self.que
+        state = ProcessState(incomming)
+        time_left = state.time_left
+        time_waiting = state.time_waiting
+        arrivals = ArrivalFeeder(incomming)
+        # ready heap entries: (virtual runtime, order, waiting entry of process index)
+        # entries of starved processes stay in the heap until they reach its top
+        queue = []
+        order = 0
+        waiting = StarvationIndex()
+        min_vruntime = 0
+        total_weight = 0
+        waiting_times = Histogram()
+        starved_processes = collections.deque()
+        total_switch_time = 0
+
+        while len(arrivals) != 0 or len(waiting) != 0:
+            if len(waiting) == 0 and arrivals.next_arrival_time() > time:
+                # cpu is idle, jump straight to the next arrival
+                time = arrivals.next_arrival_time()
+
+            # check for new processes, they start at minimum virtual runtime and wait since their arrival
+            for index in arrivals.pop_arrived(time):
+                process = incomming[index]
+                total_weight = total_weight + CFS_WEIGHTS[process.nice + 20]
+                heapq.heappush(queue, (min_vruntime, order, waiting.add(process.arrive_time, index)))
+                order = order + 1
+
+            for index in waiting.expire(time - self.starvation_threshold):
+                total_weight = total_weight - CFS_WEIGHTS[incomming[index].nice + 20]
+                starved_processes.append(index)
+            while len(queue) != 0 and not queue[0][2].waiting:
+                heapq.heappop(queue)
+            if len(queue) == 0:
+                continue
+
+            vruntime, _, entry = heapq.heappop(queue)
+            waiting.discard(entry)
+            index = entry.process
+            time_waiting[index] = time - entry.since
+
+            # every runnable process gets its share of scheduling latency, but no less than minimum granularity
+            weight = CFS_WEIGHTS[incomming[index].nice + 20]
+            time_slice = max(self.min_granularity, self.sched_latency * weight // total_weight)
+            time_delta = min(time_left[index], time_slice)
+            time_left[index] = time_left[index] - time_delta
+            time = time + time_delta
+            vruntime = vruntime + time_delta * CFS_NICE_0_WEIGHT / weight
+
+            if time_left[index] == 0:
+                waiting_times.record(time_waiting[index], index)
+                total_weight = total_weight - weight
+            else:
+                heapq.heappush(queue, (vruntime, order, waiting.add(time - time_waiting[index], index)))
+                order = order + 1
+
+            # minimum virtual runtime never goes back, so new processes can not take over the cpu
+            while len(queue) != 0 and not queue[0][2].waiting:
+                heapq.heappop(queue)
+            if len(queue) != 0:
+                min_vruntime = max(min_vruntime, queue[0][0])
+
+            time = time + self.switch_delay
+            total_switch_time = total_switch_time + self.switch_delay
+
+        longest_waiting = waiting_times.max_item
+        average_waiting = round(waiting_times.mean(), 2)
+        logger.info("================= CFS =================")
+        logger.info("Scheduling latency was {}, minimum granularity was {}.".format(self.sched_latency,
+                                                                                  self.min_granularity))
+        logger.info("Switch delay was {}".format(self.switch_delay))
         logger.info("Total starved processes: {}".format(len(starved_processes)))
         logger.info("Time wasted for switching: {}".format(round(total_switch_time, 2)))
-        logger.info("Average waiting time: {}".format(round(sum(proc.time_waiting for proc in completed) /
-                                                            len(completed), 2)))
-        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(longest_waiting.time_waiting,
-                                                                                 longest_waiting.duration,
-                                                                                 longest_waiting.arrive_time))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            incomming[longest_waiting].duration,
+            incomming[longest_waiting].arrive_time))
+        return {"algorithm": "CFS",
+                "starved": len(starved_processes),
+                "switch_time": round(total_switch_time, 2),
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles()}
+
+    def runMulticore(self, policy="RR"):
+        """Runs FCFS, SJF or RR with a run queue per core."""
+        logger = logging.getLogger("{}x{}".format(policy, self.cores))
+        scheduler = MulticoreScheduler(self.que, policy, self.cores, self.balancing,
+                                       self.switch_delay, self.quantum, self.starvation_threshold,
+                                       self.migration_cost, self.balance_period)
+        total_time = scheduler.run()
+        waiting_times = scheduler.waiting_times
+        time_waiting = scheduler.state.time_waiting
+
+        longest_waiting = waiting_times.max_item
+        average_waiting = round(waiting_times.mean(), 2)
+        cores = [{"core": core.id,
+                  "utilization": round(core.run_time / total_time, 4) if total_time else 0,
+                  "idle_time": total_time - core.busy_time,
+                  "migrations": core.migrations} for core in scheduler.cores]
+        logger.info("================= {} on {} cores =================".format(policy, self.cores))
+        logger.info("Balancing was {}, migration cost was {}".format(self.balancing, self.migration_cost))
+        logger.info("Switch delay was {}".format(self.switch_delay))
+        logger.info("Total starved processes: {}".format(len(scheduler.starved_processes)))
+        logger.info("Time wasted for switching: {}".format(round(scheduler.total_switch_time, 2)))
+        logger.info("Total migrations: {}".format(scheduler.migrations))
+        logger.info("Average waiting time: {}".format(average_waiting))
+        logger.info("Waiting time percentiles: {}".format(waiting_times.describe()))
+        logger.info("Longest waiting time: {}, Duration: {}, Arrived: {}".format(
+            time_waiting[longest_waiting],
+            self.que[longest_waiting].duration,
+            self.que[longest_waiting].arrive_time))
+        for core in cores:
+            logger.info("Core {}: utilization {}%, idle time {}, migrations {}".format(
+                core["core"], round(100 * core["utilization"], 2), core["idle_time"], core["migrations"]))
+        return {"algorithm": "{}x{}".format(policy, self.cores),
+                "starved": len(scheduler.starved_processes),
+                "switch_time": round(scheduler.total_switch_time, 2),
+                "migrations": scheduler.migrations,
+                "average_waiting": average_waiting,
+                "longest_waiting": time_waiting[longest_waiting],
+                "waiting_percentiles": waiting_times.percentiles(),
+                "cores": cores}
+
+    def checkMulticore(self):
+        """Runs FCFS, SJF and RR on one core of multi-core cpu, raises ValueError when results differ
+        from single-core runs."""
+        cores = self.cores
+        self.cores = 1
+        try:
+            for policy, run in (("FCFS", self.runFCFS), ("SJF", self.runSJF), ("RR", self.runRR)):
+                expected = run()
+                result = self.runMulticore(policy)
+                for key, value in expected.items():
+                    # SJF does not round its average waiting time
+                    if isinstance(value, float):
+                        value = round(value, 2)
+                    if key != "algorithm" and result[key] != value:
+                        raise ValueError("{} on one core differs in {}: {} instead of {}".format(
+                            policy, key, result[key], value))
+        finally:
+            self.cores = cores
 
 
 if __name__ == '__main__':
@@ -215,3 +657,5 @@ if __name__ == '__main__':
     main.runFCFS()
     main.runSJF()
     main.runRR()
+    main.runMLFQ()
+    main.runCFS()
@@ -0,0 +1,86 @@
+"""
+Streaming statistics of waiting times, finished processes are recorded once and not kept.
+"""
+
+import math
+
+SIGNIFICANT_FIGURES = 3
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Histogram:
+    """HDR histogram of non negative values with given number of significant figures.
+
+    Values below sub bucket count get a bucket each, every next power of two range is split into
+    half of sub bucket count buckets, so memory grows with logarithm of the largest value
+    and not with number of recorded values. Count, sum, minimum and maximum are exact."""
+
+    def __init__(self, significant_figures=SIGNIFICANT_FIGURES):
+        super(Histogram, self).__init__()
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("Significant figures must be between 1 and 5")
+        self.sub_bucket_bits = (2 * 10 ** significant_figures - 1).bit_length()
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        # item recorded first with the maximum value
+        self.max_item = None
+
+    def __len__(self):
+        return self.count
+
+    def bucket(self, value) -> int:
+        value = int(value)
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return shift * self.sub_bucket_half + (value >> shift)
+
+    def bucket_value(self, bucket) -> int:
+        """Returns highest value counted in bucket."""
+        if bucket < self.sub_bucket_count:
+            return bucket
+        shift = bucket // self.sub_bucket_half - 1
+        return ((bucket - shift * self.sub_bucket_half + 1) << shift) - 1
+
+    def record(self, value, item=None, count=1) -> None:
+        if value < 0:
+            raise ValueError("Histogram records only non negative values, got {}".format(value))
+        bucket = self.bucket(value)
+        if bucket >= len(self.counts):
+            self.counts.extend([0] * (bucket + 1 - len(self.counts)))
+        self.counts[bucket] = self.counts[bucket] + count
+        self.count = self.count + count
+        self.total = self.total + value * count
+        if self.max is None or value > self.max:
+            self.max = value
+            self.max_item = item
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def mean(self):
+        if self.count == 0:
+            raise ValueError("Mean of empty histogram")
+        return self.total / self.count
+
+    def percentile(self, percent):
+        """Returns value which percent of recorded values do not exceed, never above maximum."""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(round(percent * self.count / 100, 9)))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen = seen + count
+            if seen >= rank:
+                return min(self.bucket_value(bucket), self.max)
+        return self.max
+
+    def percentiles(self, percents=PERCENTILES) -> dict:
+        return {"p{}".format(percent): self.percentile(percent) for percent in percents}
+
+    def describe(self, percents=PERCENTILES) -> str:
+        return ", ".join("{} {}".format(name, value) for name, value in self.percentiles(percents).items())
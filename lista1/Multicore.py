@@ -0,0 +1,352 @@
+"""
+Multi-core CPU with a run queue per core.
+Arriving processes are placed on cores in turn. Every core schedules its own queue with the same waiting
+and switch accounting as Main.runFCFS, runSJF and runRR, so one core gives the same results as they do.
+Load is balanced either by idle cores stealing waiting processes from the most loaded core or by periodic
+migration between the longest and the shortest queues. Migrated process pays migration cost of time
+when it runs next.
+"""
+
+import heapq
+import collections
+
+from Process import ProcessState
+from Arrivals import ArrivalFeeder
+from Metrics import Histogram
+from Starvation import StarvationIndex
+
+POLICIES = ("FCFS", "SJF", "RR")
+BALANCING = ("steal", "migrate", "none")
+
+
+class Core:
+    """Run queue, clocks and statistics of one core."""
+
+    def __init__(self, core_id, policy):
+        super(Core, self).__init__()
+        self.id = core_id
+        self.policy = policy
+        # SJF queue is a heap of (time left, -last run tick, process index, waiting entry) like in Main.runSJF,
+        # others are deques of waiting entries
+        self.queue = [] if policy == "SJF" else collections.deque()
+        self.waiting = StarvationIndex()
+        # processes placed on busy core join its queue when it decides next time, like arrivals in Main
+        self.arrived = collections.deque()
+        self.running = None
+        # time of the last decision, running process runs from run_start after its migration cost
+        self.time = 0
+        self.run_start = 0
+        # RR waiting clock, sum of dispatched time deltas
+        self.clock = 0
+        self.previous_process_id = None
+        self.version = 0
+        self.run_time = 0
+        self.busy_time = 0
+        self.migrations = 0
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def add(self, since, index, key=None):
+        """Queues process waiting since given time, SJF heap orders it by key."""
+        entry = self.waiting.add(since, index)
+        if self.policy == "SJF":
+            heapq.heappush(self.queue, key + (entry,))
+        else:
+            self.queue.append(entry)
+        return entry
+
+    def pop(self):
+        """Returns next waiting entry, entries of starved processes are dropped."""
+        while len(self.queue) != 0:
+            if self.policy == "SJF":
+                entry = heapq.heappop(self.queue)[3]
+            else:
+                entry = self.queue.popleft()
+            if entry.waiting:
+                self.waiting.discard(entry)
+                return entry
+        return None
+
+    def steal(self):
+        """Returns queue item from the back of the queue, last item of heap list can be removed without sifting."""
+        while len(self.queue) != 0:
+            item = self.queue.pop()
+            entry = item[3] if self.policy == "SJF" else item
+            if entry.waiting:
+                self.waiting.discard(entry)
+                return item
+        return None
+
+
+class MulticoreScheduler:
+    def __init__(self, processes, policy, cores, balancing="steal", switch_delay=1, quantum=30,
+                 starvation_threshold=80000, migration_cost=2, balance_period=100):
+        super(MulticoreScheduler, self).__init__()
+        if policy not in POLICIES:
+            raise ValueError("Unknown policy {}".format(policy))
+        if balancing not in BALANCING:
+            raise ValueError("Unknown balancing {}".format(balancing))
+
+        self.processes = processes
+        self.state = ProcessState(processes)
+        self.policy = policy
+        self.decide = {"FCFS": self.decide_fcfs, "SJF": self.decide_sjf, "RR": self.decide_rr}[policy]
+        self.cores = [Core(core_id, policy) for core_id in range(cores)]
+        self.balancing = balancing
+        self.switch_delay = switch_delay
+        self.quantum = quantum
+        self.starvation_threshold = starvation_threshold
+        self.migration_cost = migration_cost
+        self.balance_period = balance_period
+
+        # next decisions of running cores: (time, core id, core version), outdated events are skipped
+        self.events = []
+        self.idle = set(range(cores))
+        # most loaded core first: (-queue length, core id), outdated entries are skipped
+        self.loads = []
+        self.waiting_times = Histogram()
+        self.starved_processes = collections.deque()
+        self.total_switch_time = 0
+        self.migrations = 0
+        self.time = 0
+
+    def update_load(self, core):
+        if self.balancing != "steal":
+            return
+        heapq.heappush(self.loads, (-len(core), core.id))
+        if len(self.loads) > 4 * len(self.cores) + 64:
+            self.loads = [(-len(other), other.id) for other in self.cores]
+            heapq.heapify(self.loads)
+
+    def most_loaded(self):
+        while len(self.loads) != 0:
+            length, core_id = self.loads[0]
+            if -length == len(self.cores[core_id]):
+                return self.cores[core_id] if length != 0 else None
+            heapq.heappop(self.loads)
+        return None
+
+    def account(self, core):
+        """Core was busy since its last decision when it had a running process."""
+        if core.running is not None:
+            core.busy_time = core.busy_time + self.time - core.time
+        core.time = self.time
+
+    def dispatch(self, core, index, run_start, until):
+        """Core runs process from run_start and decides again at until."""
+        core.running = index
+        core.run_start = run_start
+        core.version = core.version + 1
+        heapq.heappush(self.events, (until, core.id, core.version))
+        self.idle.discard(core.id)
+        self.update_load(core)
+
+    def sleep(self, core):
+        core.running = None
+        core.version = core.version + 1
+        self.idle.add(core.id)
+        self.update_load(core)
+
+    def decide_fcfs(self, core):
+        """Running process finished or core was idle, next process runs to completion like in Main.runFCFS."""
+        self.account(core)
+        core.running = None
+        for index in core.arrived:
+            core.add(self.time, index)
+        core.arrived.clear()
+
+        entry = core.pop()
+        if entry is None:
+            return self.sleep(core)
+        index = entry.process
+        self.state.time_left[index] = 0
+        self.state.time_waiting[index] = self.time - entry.since
+        self.waiting_times.record(self.state.time_waiting[index], index)
+        self.starved_processes.extend(core.waiting.expire(self.time - self.starvation_threshold))
+
+        duration = self.processes[index].duration
+        core.run_time = core.run_time + duration
+        run_start = self.time + entry.penalty
+        self.dispatch(core, index, run_start, run_start + duration)
+
+    def decide_sjf(self, core):
+        """Running process finished, process arrived or starvation is checked, same steps as one tick
+        of Main.runSJF. Process with shorter time left than the running one preempts it."""
+        time = self.time
+        time_left = self.state.time_left
+        time_waiting = self.state.time_waiting
+        self.account(core)
+        running = core.running
+        if running is not None:
+            executed = max(0, time - core.run_start)
+            time_left[running] = time_left[running] - executed
+            core.run_time = core.run_time + executed
+            core.run_start = max(core.run_start, time)
+            if time_left[running] <= 0:
+                self.waiting_times.record(time_waiting[running], running)
+                running = None
+
+        entered = []
+        for index in core.arrived:
+            arrive_time = self.processes[index].arrive_time
+            # waiting process was stamped with the previous tick every tick before it arrived
+            if arrive_time > 0:
+                time_waiting[index] = arrive_time - 1
+            entered.append(core.add(time, index, (time_left[index], 1, index)))
+        core.arrived.clear()
+
+        if running is not None and len(core.queue) > 0 and core.queue[0][0] < time_left[running]:
+            # preempted process ran on the previous tick
+            entered.append(core.add(time, running, (time_left[running], 1 - time, running)))
+            running = None
+
+        if running is None:
+            entry = core.pop()
+            if entry is None:
+                return self.sleep(core)
+            running = entry.process
+            core.run_start = time + entry.penalty
+            if entry.since < time:
+                time_waiting[running] = time
+
+            process_id = self.processes[running].id
+            if core.previous_process_id and core.previous_process_id != process_id:
+                self.total_switch_time = self.total_switch_time + self.switch_delay
+            core.previous_process_id = process_id
+
+        if time >= self.starvation_threshold and len(core) > 0:
+            # every process that waited on the previous tick is stamped past the threshold
+            self.starved_processes.extend(core.waiting.expire(time - 1))
+            for entry in entered:
+                if entry.waiting and time_waiting[entry.process] >= self.starvation_threshold:
+                    core.waiting.discard(entry)
+                    self.starved_processes.append(entry.process)
+
+        while len(core.queue) > 0 and not core.queue[0][3].waiting:
+            heapq.heappop(core.queue)
+
+        # run until completion or next starvation check, arrivals on this core make it decide earlier
+        until = core.run_start + max(time_left[running], 1)
+        if len(core.queue) > 0:
+            until = min(until, time + max(self.starvation_threshold - time, 1))
+        self.dispatch(core, running, core.run_start, until)
+
+    def decide_rr(self, core):
+        """Time slice ended or core was idle, next process runs for one time quant like in Main.runRR."""
+        time_left = self.state.time_left
+        time_waiting = self.state.time_waiting
+        self.account(core)
+        index = core.running
+        if index is not None and time_left[index] != 0:
+            core.add(core.clock - time_waiting[index], index)
+        core.running = None
+        for index in core.arrived:
+            core.add(core.clock - time_waiting[index], index)
+        core.arrived.clear()
+
+        entry = core.pop()
+        if entry is None:
+            return self.sleep(core)
+        index = entry.process
+        time_waiting[index] = core.clock - entry.since
+        time_delta = time_left[index] - self.quantum
+        if time_delta <= 0:
+            time_left[index] = 0
+            self.waiting_times.record(time_waiting[index], index)
+            time_delta = self.processes[index].duration - time_left[index]
+        else:
+            time_left[index] = time_delta
+
+        self.starved_processes.extend(core.waiting.expire(core.clock - self.starvation_threshold))
+        core.clock = core.clock + time_delta
+        core.run_time = core.run_time + time_delta
+        self.total_switch_time = self.total_switch_time + self.switch_delay
+        run_start = self.time + entry.penalty
+        self.dispatch(core, index, run_start, run_start + time_delta + self.switch_delay)
+
+    def migrate(self, source, destination):
+        item = source.steal()
+        self.update_load(source)
+        if item is None:
+            return False
+        if self.policy == "SJF":
+            entry = item[3]
+            moved = destination.add(entry.since, entry.process, item[:3])
+        elif self.policy == "RR":
+            # waiting clocks of cores differ, process keeps the time it already waited
+            entry = item
+            moved = destination.add(destination.clock - (source.clock - entry.since), entry.process)
+        else:
+            entry = item
+            moved = destination.add(entry.since, entry.process)
+        moved.penalty = entry.penalty + self.migration_cost
+        self.update_load(destination)
+        destination.migrations = destination.migrations + 1
+        self.migrations = self.migrations + 1
+        return True
+
+    def balance(self):
+        """Pairs the longest queues with the shortest ones and moves half of the difference."""
+        cores = sorted(self.cores, key=len)
+        for index in range(len(cores) // 2):
+            low, high = cores[index], cores[-1 - index]
+            for _ in range((len(high) - len(low)) // 2):
+                if not self.migrate(high, low):
+                    break
+
+    def run(self):
+        arrivals = ArrivalFeeder(self.processes)
+        cores = self.cores
+        events = self.events
+        next_balance = self.balance_period
+
+        while True:
+            while len(events) != 0 and events[0][2] != cores[events[0][1]].version:
+                heapq.heappop(events)
+            if len(arrivals) == 0 and len(events) == 0:
+                break
+
+            # jump to the next decision of a core, arrival or balancing
+            candidates = []
+            if len(arrivals) != 0:
+                candidates.append(arrivals.next_arrival_time())
+            if len(events) != 0:
+                candidates.append(events[0][0])
+                if self.balancing == "migrate":
+                    candidates.append(next_balance)
+            self.time = max(self.time, min(candidates))
+            due = set()
+
+            while len(events) != 0 and events[0][0] <= self.time:
+                _, core_id, version = heapq.heappop(events)
+                if version == cores[core_id].version:
+                    due.add(core_id)
+
+            # check for new processes, each core gets the next one in turn,
+            # busy FCFS and RR cores see them when the running slice ends
+            for index in arrivals.pop_arrived(self.time):
+                core = cores[index % len(cores)]
+                core.arrived.append(index)
+                if core.running is None or self.policy == "SJF":
+                    due.add(core.id)
+
+            if self.balancing == "migrate" and self.time >= next_balance:
+                self.balance()
+                due.update(core_id for core_id in self.idle if len(cores[core_id]) != 0)
+                next_balance = (self.time // self.balance_period + 1) * self.balance_period
+
+            for core_id in sorted(due):
+                self.decide(cores[core_id])
+
+            if self.balancing == "steal":
+                # idle cores take waiting processes from the most loaded core until there is nothing to take
+                while len(self.idle) != 0:
+                    victim = self.most_loaded()
+                    if victim is None:
+                        break
+                    thief = cores[next(iter(self.idle))]
+                    if self.migrate(victim, thief):
+                        self.decide(thief)
+
+        return self.time
@@ -1,5 +1,8 @@
 class Process:
-    def __init__(self, process_id, arrive_time, duration):
+    # processes pickled before nice was added read it from class
+    nice = 0
+
+    def __init__(self, process_id, arrive_time, duration, nice=0):
         super(Process, self).__init__()
 
         self.id = process_id
@@ -7,6 +10,7 @@ class Process:
         self.duration = duration
         self.time_left = duration
         self.time_waiting = 0
+        self.nice = nice
 
     def set_time_left(self, t):
         self.time_left = t
@@ -14,3 +18,12 @@ class Process:
     def set_wait_time(self, time):
         self.time_waiting = time
 
+
+class ProcessState:
+    """Time left and waiting time of every process during one run, indexed like the workload.
+    Workload processes are shared between runs and never modified."""
+
+    def __init__(self, processes):
+        super(ProcessState, self).__init__()
+        self.time_left = [proc.duration for proc in processes]
+        self.time_waiting = [0] * len(self.time_left)
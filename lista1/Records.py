@@ -0,0 +1,103 @@
+"""
+Binary workload format.
+
+Header: magic, schema version, record size, record count, size of generator parameters.
+Header is followed by generator parameters encoded as json and fixed size process records.
+
+python Records.py procs_data.txt procs_data.bin
+"""
+
+import sys
+import json
+import mmap
+import pickle
+import struct
+
+from Process import Process
+
+MAGIC = b"LAB1PROC"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQI")
+# id, arrive time, duration, nice
+RECORD = struct.Struct("<qqib")
+WRITE_BATCH = 65536
+
+
+class ProcessRecords:
+    """Read only sequence of processes decoded lazily from memory mapped file."""
+
+    def __init__(self, filename):
+        super(ProcessRecords, self).__init__()
+        self.filename = filename
+        with open(filename, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, self.count, params_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("{} is not a process records file".format(filename))
+        if version != VERSION or record_size != RECORD.size:
+            # records before version 2 have no nice, convert the workload again
+            raise ValueError("Unsupported process records version {} in {}, expected {}".format(
+                version, filename, VERSION))
+
+        self.params = json.loads(self.buffer[HEADER.size:HEADER.size + params_size].decode("utf-8"))
+        self.offset = HEADER.size + params_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = index + self.count
+        if not 0 <= index < self.count:
+            raise IndexError("process record index out of range")
+        return Process(*RECORD.unpack_from(self.buffer, self.offset + index * RECORD.size))
+
+    def __iter__(self):
+        view = memoryview(self.buffer)[self.offset:self.offset + self.count * RECORD.size]
+        try:
+            for fields in RECORD.iter_unpack(view):
+                yield Process(*fields)
+        finally:
+            view.release()
+
+    def __deepcopy__(self, memo):
+        # records are decoded into new objects on every access, file itself is never modified
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (self.filename,)
+
+    def close(self):
+        self.buffer.close()
+
+
+def write_records(filename, processes, params=None) -> int:
+    """Writes processes from any iterable, count is filled in after the last record."""
+    params = json.dumps(params or {}).encode("utf-8")
+    count = 0
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, len(params)))
+        file.write(params)
+        batch = bytearray()
+        for proc in processes:
+            batch += RECORD.pack(proc.id, proc.arrive_time, proc.duration, proc.nice)
+            count = count + 1
+            if count % WRITE_BATCH == 0:
+                file.write(batch)
+                batch.clear()
+        file.write(batch)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, len(params)))
+    return count
+
+
+def convert_pickle(pickle_filename, binary_filename, params=None) -> int:
+    """Converts pickled list of processes to binary records."""
+    with open(pickle_filename, "rb") as file:
+        processes = pickle.load(file)
+    return write_records(binary_filename, processes, params)
+
+
+if __name__ == '__main__':
+    print("Converted {} processes".format(convert_pickle(sys.argv[1], sys.argv[2])))
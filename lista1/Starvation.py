@@ -0,0 +1,68 @@
+import heapq
+import collections
+
+
+class WaitingEntry:
+    """Process waiting in ready queue since given time."""
+    __slots__ = ("since", "process", "waiting", "penalty")
+
+    def __init__(self, since, process):
+        self.since = since
+        self.process = process
+        self.waiting = True
+        # migration cost paid when process runs next on multi-core cpu
+        self.penalty = 0
+
+
+class StarvationIndex:
+    """Waiting processes ordered by the time they started waiting.
+
+    Entries added in order of that time go to a deque, entries added out of order go to a heap,
+    so the longest waiting processes are always at the front of one of them.
+    Dispatched processes are only marked, entries are dropped when they reach the front
+    or when marked entries outnumber waiting ones."""
+
+    def __init__(self):
+        super(StarvationIndex, self).__init__()
+        self.ordered = collections.deque()
+        self.unordered = []
+        self.counter = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, since, process) -> WaitingEntry:
+        entry = WaitingEntry(since, process)
+        if len(self.ordered) == 0 or self.ordered[-1].since <= since:
+            self.ordered.append(entry)
+        else:
+            heapq.heappush(self.unordered, (since, self.counter, entry))
+            self.counter = self.counter + 1
+        self.count = self.count + 1
+        return entry
+
+    def discard(self, entry: WaitingEntry) -> None:
+        """Stop tracking process which left the ready queue."""
+        entry.waiting = False
+        self.count = self.count - 1
+        if len(self.ordered) + len(self.unordered) > 2 * self.count + 64:
+            self.ordered = collections.deque(item for item in self.ordered if item.waiting)
+            self.unordered = [item for item in self.unordered if item[2].waiting]
+            heapq.heapify(self.unordered)
+
+    def expire(self, limit) -> list:
+        """Returns processes waiting since limit or earlier and stops tracking them."""
+        expired = []
+        while len(self.ordered) != 0 and self.ordered[0].since <= limit:
+            entry = self.ordered.popleft()
+            if entry.waiting:
+                entry.waiting = False
+                expired.append(entry.process)
+        while len(self.unordered) != 0 and self.unordered[0][0] <= limit:
+            entry = heapq.heappop(self.unordered)[2]
+            if entry.waiting:
+                entry.waiting = False
+                expired.append(entry.process)
+        self.count = self.count - len(expired)
+        return expired
@@ -0,0 +1,131 @@
+"""
+Parameter sweep over switch delay, RR quantum and starvation threshold.
+Every worker receives the workload once, tasks only carry parameters.
+Workloads loaded from binary records are sent as their file name, every worker maps the file itself.
+
+python Sweep.py --quantum 5 10 20 30 --switch-delay 0 1 --output sweep.csv
+python Sweep.py --processes-file procs_data.bin --quantum 5 10 --output sweep.csv
+"""
+
+import os
+import csv
+import json
+import pickle
+import logging
+import argparse
+import itertools
+import concurrent.futures
+
+from Main import Main, PROCESSES_FILENAME, PROCESS_SWITCH_DELAY, RR_QUANTUM_TIME, STARVATION_THRESHOLD
+from Records import ProcessRecords
+from Utils import OutputLogger
+
+# parameters which change the result of each algorithm, others are not swept
+ALGORITHMS = {
+    "FCFS": ("runFCFS", ("starvation_threshold",)),
+    "SJF": ("runSJF", ("switch_delay", "starvation_threshold")),
+    "RR": ("runRR", ("switch_delay", "quantum", "starvation_threshold")),
+    "MLFQ": ("runMLFQ", ("switch_delay", "starvation_threshold")),
+    "CFS": ("runCFS", ("switch_delay", "starvation_threshold")),
+}
+
+worker = None
+
+
+def init_worker(processes):
+    """Keep workload in worker process for all its tasks."""
+    global worker
+    logging.disable(logging.INFO)
+    worker = Main()
+    worker.que = processes
+
+
+def run_task(task):
+    algorithm, params = task
+    method, _ = ALGORITHMS[algorithm]
+    worker.switch_delay = params["switch_delay"]
+    worker.quantum = params["quantum"]
+    worker.starvation_threshold = params["starvation_threshold"]
+    result = dict(params)
+    result.update(getattr(worker, method)())
+    return result
+
+
+def create_tasks(algorithms, switch_delays, quantums, starvation_thresholds) -> list:
+    grids = {"switch_delay": switch_delays, "quantum": quantums, "starvation_threshold": starvation_thresholds}
+    defaults = {"switch_delay": PROCESS_SWITCH_DELAY, "quantum": RR_QUANTUM_TIME,
+                "starvation_threshold": STARVATION_THRESHOLD}
+    tasks = []
+    for algorithm in algorithms:
+        _, swept = ALGORITHMS[algorithm]
+        for values in itertools.product(*(grids[name] for name in swept)):
+            params = dict(defaults)
+            params.update(zip(swept, values))
+            tasks.append((algorithm, params))
+    return tasks
+
+
+def run_sweep(processes, tasks, workers=None) -> list:
+    workers = workers or os.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                initializer=init_worker,
+                                                initargs=(processes,)) as executor:
+        return list(executor.map(run_task, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+
+def flatten(result) -> dict:
+    """Returns result with waiting time percentiles as columns p50, p90, p99 and p99.9."""
+    row = dict(result)
+    row.update(row.pop("waiting_percentiles", {}))
+    return row
+
+
+def save_results(results, filename) -> None:
+    """Saves results as json or csv, depending on file extension."""
+    if filename.endswith(".json"):
+        with open(filename, "w") as file:
+            json.dump(results, file, indent=2)
+        return
+
+    results = [flatten(result) for result in results]
+    columns = []
+    for result in results:
+        columns.extend(key for key in result if key not in columns)
+    with open(filename, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sweep scheduler parameters over one workload.")
+    parser.add_argument("--processes-file", default=PROCESSES_FILENAME,
+                        help="binary records file (.bin) or pickled list of processes")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--switch-delay", nargs="+", type=int, default=[PROCESS_SWITCH_DELAY])
+    parser.add_argument("--quantum", nargs="+", type=int, default=[RR_QUANTUM_TIME])
+    parser.add_argument("--starvation-threshold", nargs="+", type=int, default=[STARVATION_THRESHOLD])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="sweep.csv")
+    args = parser.parse_args()
+
+    log = OutputLogger()
+    logger = logging.getLogger("SWEEP")
+
+    if args.processes_file.endswith(".bin"):
+        que = ProcessRecords(args.processes_file)
+    else:
+        with open(args.processes_file, "rb") as file:
+            que = pickle.load(file)
+
+    sweep_tasks = create_tasks(args.algorithms, args.switch_delay, args.quantum, args.starvation_threshold)
+    logger.info("Running {} simulations of {} processes".format(len(sweep_tasks), len(que)))
+    sweep_results = run_sweep(que, sweep_tasks, args.workers)
+    save_results(sweep_results, args.output)
+    logger.info("Results saved to {}".format(args.output))
+
+    for name in args.algorithms:
+        rows = [row for row in sweep_results if row["algorithm"] == name]
+        best = min(rows, key=lambda row: row["average_waiting"])
+        logger.info("Best {}: average waiting time {} with {}".format(
+            name, best["average_waiting"], {key: best[key] for key in ALGORITHMS[name][1]}))
@@ -0,0 +1,178 @@
+"""
+Schedule trace, which process ran on the cpu and when.
+
+Intervals are written in compressed chunks, so a trace of any length holds only one chunk in memory.
+Each chunk has columns stored one after another: process ids and start times as differences from
+the previous interval, interval lengths and end events. Every column is stored in the smallest
+integer type holding its values in that chunk.
+Header: magic, schema version, size of trace parameters. Header is followed by trace parameters
+encoded as json and chunks, each prefixed with interval count, compressed size and item sizes of columns.
+
+Tracing was meant to slow a run down by under 10%, it does not for RR and for FCFS of pickled processes.
+Paired runs of 5000 processes: SJF about 8%, RR about 13%, FCFS about 4% from a records file and 16%
+from pickled processes, whose columns are built from process objects after the run.
+RR gives an interval about every 3 us and the recorder call alone, with nothing recorded, costs about 8%
+of that. Sampling and windows make traces smaller, not cheaper, every interval is still passed to the recorder.
+
+python Trace.py trace_RR.bin > trace_RR.csv
+"""
+
+import sys
+import json
+import zlib
+import struct
+
+import numpy as np
+
+MAGIC = b"LAB1TRCE"
+VERSION = 1
+HEADER = struct.Struct("<8sHI")
+CHUNK = struct.Struct("<II4B")
+CHUNK_SIZE = 65536
+COMPRESSION_LEVEL = 1
+
+# how interval ended
+FINISHED = 0
+PREEMPTED = 1
+EVENTS = ("finished", "preempted")
+# signed integer types by item size
+TYPES = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+
+
+class TraceRecorder:
+    """Writes run intervals of processes to trace file.
+
+    Intervals are buffered as they come and split into columns when a chunk is written, schedules known
+    as whole columns are written straight from them. Sampling keeps every nth interval and only intervals
+    overlapping the (start, end) time window, intervals are counted before the window is checked."""
+
+    def __init__(self, filename, params=None, every=1, window=None, chunk_size=CHUNK_SIZE):
+        super(TraceRecorder, self).__init__()
+        if every < 1:
+            raise ValueError("Trace sampling must keep every 1st or further interval, got {}".format(every))
+        if window is not None and window[0] >= window[1]:
+            raise ValueError("Trace window {} is empty".format(window))
+        self.every = every
+        self.window = window
+        # buffer holds process id, start, end and event of every interval one after another
+        self.buffer = []
+        self.chunk_size = chunk_size
+        self.buffer_size = 4 * chunk_size
+        self.counter = 0
+        self.recorded = 0
+        self.last_process = 0
+        self.last_start = 0
+
+        params = dict(params or {})
+        params.update({"every": every, "window": window})
+        params = json.dumps(params).encode("utf-8")
+        self.file = open(filename, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(params)))
+        self.file.write(params)
+
+    def record(self, process_id, start, end, event) -> None:
+        buffer = self.buffer
+        buffer.extend((process_id, start, end, event))
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def record_columns(self, process_ids, starts, ends, event) -> None:
+        """Records intervals given as arrays, all of them ended with the same event."""
+        self.flush()
+        for first in range(0, len(starts), self.chunk_size):
+            last = first + self.chunk_size
+            self.write(process_ids[first:last], starts[first:last], ends[first:last],
+                       np.full(len(starts[first:last]), event, dtype=np.int64))
+
+    def flush(self) -> None:
+        if len(self.buffer) == 0:
+            return
+        # packing python integers with struct is about twice as fast as numpy.fromiter
+        buffer = self.buffer
+        process, start, end, event = np.frombuffer(struct.pack("<{}q".format(len(buffer)), *buffer),
+                                                   dtype=np.int64).reshape(-1, 4).T
+        self.buffer.clear()
+        self.write(process, start, end, event)
+
+    def write(self, process, start, end, event) -> None:
+        """Writes one chunk of sampled interval columns."""
+        keep = None
+        if self.every != 1:
+            keep = (np.arange(self.counter, self.counter + len(process)) % self.every) == 0
+        self.counter = self.counter + len(process)
+        if self.window is not None:
+            inside = (end > self.window[0]) & (start < self.window[1])
+            keep = inside if keep is None else keep & inside
+        if keep is not None:
+            process, start, end, event = process[keep], start[keep], end[keep], event[keep]
+        count = len(process)
+        if count == 0:
+            return
+
+        columns = [narrow(np.diff(process, prepend=self.last_process)),
+                   narrow(np.diff(start, prepend=self.last_start)),
+                   narrow(end - start),
+                   event.astype(np.int8)]
+        self.last_process = int(process[-1])
+        self.last_start = int(start[-1])
+        # columns are differences with long runs of the same values, run length matching compresses them
+        # about as well as the default strategy in half of the time
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_RLE)
+        data = compressor.compress(b"".join(column.tobytes() for column in columns)) + compressor.flush()
+        self.file.write(CHUNK.pack(count, len(data), *(column.itemsize for column in columns)))
+        self.file.write(data)
+        self.recorded = self.recorded + count
+
+    def close(self) -> int:
+        """Writes buffered intervals, returns number of recorded intervals."""
+        self.flush()
+        self.file.close()
+        return self.recorded
+
+
+def narrow(column):
+    """Returns column in the smallest signed integer type holding all its values."""
+    low, high = int(column.min()), int(column.max())
+    for dtype in TYPES.values():
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return column.astype(dtype)
+    return column
+
+
+def read_trace(filename):
+    """Returns trace parameters and columns of all intervals: process ids, starts, ends and events."""
+    with open(filename, "rb") as file:
+        magic, version, params_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("{} is not a trace file".format(filename))
+        if version != VERSION:
+            raise ValueError("Unsupported trace version {} in {}".format(version, filename))
+        params = json.loads(file.read(params_size).decode("utf-8"))
+
+        columns = ([], [], [], [])
+        while True:
+            prefix = file.read(CHUNK.size)
+            if len(prefix) < CHUNK.size:
+                break
+            count, size, *item_sizes = CHUNK.unpack(prefix)
+            data = zlib.decompress(file.read(size))
+            offset = 0
+            for column, item_size in zip(columns, item_sizes):
+                column.append(np.frombuffer(data, dtype=TYPES[item_size], count=count, offset=offset)
+                              .astype(np.int64))
+                offset = offset + count * item_size
+
+    if len(columns[0]) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return params, empty, empty, empty, np.zeros(0, dtype=np.int8)
+    process, deltas, length, event = (np.concatenate(column) for column in columns)
+    start = np.cumsum(deltas)
+    return params, np.cumsum(process), start, start + length, event.astype(np.int8)
+
+
+if __name__ == '__main__':
+    trace_params, ids, starts, ends, events = read_trace(sys.argv[1])
+    print("process,start,end,event")
+    for row in zip(ids.tolist(), starts.tolist(), ends.tolist(), events.tolist()):
+        print("{},{},{},{}".format(row[0], row[1], row[2], EVENTS[row[3]]))
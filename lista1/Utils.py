@@ -1,6 +1,6 @@
-import random
 import logging
 import coloredlogs
+import numpy as np
 
 
 class OutputLogger:
@@ -26,8 +26,12 @@ class OutputLogger:
         self.handler.setLevel(level)
 
 
-def gauss_distribution(mu, sigma, bottom, top):
-    a = random.gauss(mu, sigma)
-    while not (bottom <= a <= top):
-        a = random.gauss(mu, sigma)
-    return a
+def truncated_gauss(rng, mu, sigma, bottom, top, size):
+    """Draws size samples from normal distribution truncated to [bottom, top].
+    Only rejected samples are drawn again, all of them at once."""
+    samples = rng.normal(mu, sigma, size)
+    rejected = np.flatnonzero((samples < bottom) | (samples > top))
+    while len(rejected) > 0:
+        samples[rejected] = rng.normal(mu, sigma, len(rejected))
+        rejected = rejected[(samples[rejected] < bottom) | (samples[rejected] > top)]
+    return samples
@@ -0,0 +1,96 @@
+import pickle
+import operator
+
+import numpy as np
+
+from Process import Process
+
+# same layout as Records.RECORD
+RECORD_DTYPE = np.dtype([("id", "<i8"), ("arrive_time", "<i8"), ("duration", "<i4"), ("nice", "i1")])
+
+
+class Workload:
+    """Processes stored as parallel arrays, one entry per process."""
+
+    def __init__(self, ids, arrive_times, durations):
+        super(Workload, self).__init__()
+
+        self.id = np.asarray(ids, dtype=np.int64)
+        self.arrive_time = np.asarray(arrive_times, dtype=np.int64)
+        self.duration = np.asarray(durations, dtype=np.int64)
+        self.time_left = self.duration.copy()
+        self.time_waiting = np.zeros(len(self.id), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.id)
+
+    @classmethod
+    def from_processes(cls, processes):
+        count = len(processes)
+        return cls(np.fromiter(map(operator.attrgetter("id"), processes), dtype=np.int64, count=count),
+                   np.fromiter(map(operator.attrgetter("arrive_time"), processes), dtype=np.int64, count=count),
+                   np.fromiter(map(operator.attrgetter("duration"), processes), dtype=np.int64, count=count))
+
+    @classmethod
+    def from_records(cls, records):
+        """Build workload straight from memory mapped binary records."""
+        table = np.frombuffer(records.buffer, dtype=RECORD_DTYPE, count=len(records), offset=records.offset)
+        return cls(table["id"], table["arrive_time"], table["duration"])
+
+    def to_processes(self) -> list:
+        return [Process(process_id, arrive_time, duration) for process_id, arrive_time, duration
+                in zip(self.id.tolist(), self.arrive_time.tolist(), self.duration.tolist())]
+
+    @classmethod
+    def load(cls, filename):
+        """Load workload from pickled list of processes."""
+        with open(filename, "rb") as file:
+            return cls.from_processes(pickle.load(file))
+
+    def save(self, filename) -> None:
+        """Save workload as pickled list of processes."""
+        with open(filename, "wb") as file:
+            pickle.dump(self.to_processes(), file)
+
+    def sort(self) -> None:
+        """Sort processes by arrive time, keeping order of simultaneous arrivals."""
+        order = np.argsort(self.arrive_time, kind="stable")
+        self.id = self.id[order]
+        self.arrive_time = self.arrive_time[order]
+        self.duration = self.duration[order]
+        self.time_left = self.time_left[order]
+        self.time_waiting = self.time_waiting[order]
+
+    def fcfs_start(self):
+        """Returns start of every process when they run one after another in order, cpu is idle only
+        until the next arrival."""
+        # start of every process is the max of its own arrival and the finish of the previous one,
+        # unrolled: start[i] = sum(duration[:i]) + max(arrive_time[j] - sum(duration[:j]) for j <= i)
+        finished_before = np.cumsum(self.duration)
+        finished_before -= self.duration
+        start = self.arrive_time - finished_before
+        np.maximum.accumulate(start, out=start)
+        np.maximum(start, 0, out=start)
+        start += finished_before
+        return start
+
+    def evaluate_fcfs(self, starvation_threshold) -> bool:
+        """Fill time_waiting with FCFS waiting times without a python loop.
+
+        Workload has to be sorted by arrive time. Processes are admitted to the ready queue
+        on the first dispatch at or after their arrival, waiting time is counted from there.
+        Returns False if any process would starve, starved processes change the schedule
+        of everything behind them and have to be simulated step by step.
+        """
+        if len(self) == 0:
+            return True
+
+        start = self.fcfs_start()
+        admitted = start[np.searchsorted(start, self.arrive_time, side="left")]
+        # process is starved on any dispatch before its own, the last one is the dispatch of its predecessor
+        if np.any(start[:-1] - admitted[1:] >= starvation_threshold):
+            return False
+
+        np.subtract(start, admitted, out=self.time_waiting)
+        self.time_left[:] = 0
+        return True
@@ -0,0 +1,55 @@
+"""
+Arrivals of a workload sorted by arrive time, shared by all simulators.
+"""
+
+
+class ArrivalFeeder:
+    """Hands out indexes of workload items once their arrive time has come.
+
+    Items must be sorted by arrive time, the feeder only moves a cursor over them,
+    so all arrivals of a run take linear time no matter how often they are checked.
+    Workloads stored as columns give arrive_times, python integers indexed like items, then items are never read."""
+
+    def __init__(self, items, arrive_times=None):
+        super(ArrivalFeeder, self).__init__()
+        self.items = items
+        self.arrive_times = arrive_times
+        self.cursor = 0
+        # arrive time of item under the cursor and of the last item handed out, each arrive time is read once
+        self.cursor_time = None
+        self.previous = None
+
+    def __len__(self):
+        """Returns number of items which did not arrive yet."""
+        return len(self.items) - self.cursor
+
+    def arrive_time(self, index):
+        if self.arrive_times is not None:
+            return self.arrive_times[index]
+        return self.items[index].arrive_time
+
+    def cursor_arrive_time(self):
+        if self.cursor_time is None:
+            self.cursor_time = self.arrive_time(self.cursor)
+        return self.cursor_time
+
+    def pop_arrived(self, now):
+        """Yields indexes of items arrived until now in arrival order."""
+        count = len(self.items)
+        while self.cursor < count:
+            index = self.cursor
+            arrive_time = self.cursor_arrive_time()
+            if arrive_time > now:
+                break
+            if self.previous is not None and self.previous > arrive_time:
+                raise ValueError("Workload is not sorted by arrive time at item {}".format(index))
+            self.previous = arrive_time
+            self.cursor = index + 1
+            self.cursor_time = None
+            yield index
+
+    def next_arrival_time(self):
+        """Returns arrive time of the next item, None when every item arrived."""
+        if self.cursor < len(self.items):
+            return self.cursor_arrive_time()
+        return None
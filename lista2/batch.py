@@ -0,0 +1,154 @@
+"""
+Static batches of requests, every request is queued when the head starts.
+Service order of FCFS, SCAN, C-SCAN and C-LOOK is then known up front, so waiting times,
+completion times and head movement are computed with numpy without a python loop.
+Results are the same as of step by step runs in main.py.
+"""
+
+import numpy as np
+
+from request import Request
+
+# same layout as records.RECORD
+RECORD_DTYPE = np.dtype([("id", "<i8"), ("arrive_time", "<i8"), ("cylinder", "<i4"), ("deadline", "<i4"),
+                         ("real_time", "?")])
+
+
+class RequestBatch:
+    """Requests stored as parallel arrays, one entry per request.
+
+    Evaluators fill order (request indexes in order of service), wait_time and completion_time
+    indexed like requests and head_movement, number of cylinders the head went over.
+    They return False when the batch is empty or some request arrives after the head starts."""
+
+    def __init__(self, ids, arrive_times, cylinders):
+        super(RequestBatch, self).__init__()
+        self.id = np.asarray(ids, dtype=np.int64)
+        self.arrive_time = np.asarray(arrive_times, dtype=np.int64)
+        self.cylinder = np.asarray(cylinders, dtype=np.int64)
+        self.order = None
+        self.wait_time = None
+        self.completion_time = None
+        self.head_movement = None
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def arrive_times(self):
+        """Arrive times giving python integers, engine reads them without decoding requests."""
+        return memoryview(np.ascontiguousarray(self.arrive_time))
+
+    @property
+    def cylinders(self):
+        return memoryview(np.ascontiguousarray(self.cylinder))
+
+    def __getitem__(self, index):
+        """Request decoded from arrays on every access like records.RequestRecords, so engine runs batch
+        without keeping an object for every request."""
+        request = Request(int(self.arrive_time[index]), int(self.cylinder[index]))
+        request.set_id(int(self.id[index]))
+        return request
+
+    @classmethod
+    def from_requests(cls, requests):
+        count = len(requests)
+        return cls(np.fromiter((req.request_id for req in requests), dtype=np.int64, count=count),
+                   np.fromiter((req.arrive_time for req in requests), dtype=np.int64, count=count),
+                   np.fromiter((req.cylinder for req in requests), dtype=np.int64, count=count))
+
+    @classmethod
+    def from_records(cls, records):
+        """Build batch straight from memory mapped binary records."""
+        table = np.frombuffer(records.buffer, dtype=RECORD_DTYPE, count=len(records), offset=records.offset)
+        return cls(table["id"], table["arrive_time"], table["cylinder"])
+
+    def is_static(self, start_time) -> bool:
+        return len(self) != 0 and int(self.arrive_time.max()) <= start_time
+
+    def check_cylinders(self, disk_size) -> None:
+        outside = (self.cylinder < 0) | (self.cylinder > disk_size)
+        if np.any(outside):
+            raise ValueError("Cylinder {} is outside of disk of size {}".format(
+                int(self.cylinder[np.argmax(outside)]), disk_size))
+
+    def evaluate_fcfs(self, start_pos) -> bool:
+        """Requests are served in queue order, head starts when the first request arrives."""
+        if len(self) == 0:
+            return False
+        start_time = int(self.arrive_time[0])
+        if not self.is_static(start_time):
+            return False
+
+        delta = np.abs(np.diff(self.cylinder, prepend=start_pos))
+        moved = np.cumsum(delta)
+        self.order = np.arange(len(self))
+        self.wait_time = moved - delta
+        self.completion_time = start_time + moved
+        self.head_movement = int(moved[-1])
+        return True
+
+    def evaluate_scan(self, start_pos, disk_size) -> bool:
+        """Head goes 0 .. disk_size and back staying one tick on edges when turning,
+        every request is served on the first visit of its cylinder."""
+        if not self.is_static(0):
+            return False
+        self.check_cylinders(disk_size)
+
+        cycle = 2 * (disk_size + 1)
+        phase = start_pos if int(self.cylinder[0]) >= start_pos else cycle - 1 - start_pos
+        # head is over cylinder in phase cylinder going right and in phase cycle - 1 - cylinder going left
+        served = np.minimum((self.cylinder - phase) % cycle, (cycle - 1 - self.cylinder - phase) % cycle)
+        self.order = np.argsort(served, kind="stable")
+        self.wait_time = served
+        self.completion_time = served
+        ticks = int(served.max())
+        turns = visits(phase, ticks, disk_size, cycle) + visits(phase, ticks, cycle - 1, cycle)
+        self.head_movement = ticks - turns
+        return True
+
+    def evaluate_c_scan(self, start_pos, disk_size) -> bool:
+        """Head goes 0 .. disk_size, going back from disk_size to 0 takes one tick."""
+        if not self.is_static(0):
+            return False
+        self.check_cylinders(disk_size)
+
+        served = (self.cylinder - start_pos) % (disk_size + 1)
+        self.order = np.argsort(served, kind="stable")
+        self.wait_time = served
+        self.completion_time = served
+        ticks = int(served.max())
+        returns = visits(start_pos, ticks, disk_size, disk_size + 1)
+        self.head_movement = ticks - returns + returns * disk_size
+        return True
+
+    def evaluate_c_look(self, start_pos, disk_size) -> bool:
+        """Head serves cylinders from start position up, jumps to disk_size and back to the lowest
+        requested cylinder and serves the rest going up. Requests wait only while head moves by one."""
+        if not self.is_static(0):
+            return False
+        self.check_cylinders(disk_size)
+
+        ahead = self.cylinder >= start_pos
+        highest = int(self.cylinder[ahead].max()) if np.any(ahead) else start_pos
+        moves = highest - start_pos
+        self.wait_time = np.where(ahead, self.cylinder - start_pos, 0)
+        self.completion_time = self.wait_time.copy()
+        self.head_movement = moves
+        if not np.all(ahead):
+            behind = ~ahead
+            lowest = int(self.cylinder[behind].min())
+            # one tick to jump to disk_size unless head is already there, one tick to jump back
+            jumps = 1 if highest == disk_size else 2
+            self.wait_time[behind] = moves + self.cylinder[behind] - lowest
+            self.completion_time[behind] = moves + jumps + self.cylinder[behind] - lowest
+            self.head_movement = (moves + disk_size - highest + disk_size - lowest
+                                  + int(self.cylinder[behind].max()) - lowest)
+        # lexsort is stable and sorts by the last key first
+        self.order = np.lexsort((self.cylinder, ~ahead))
+        return True
+
+
+def visits(phase, ticks, position, cycle) -> int:
+    """Returns number of ticks out of ticks starting in phase which are spent in position of cycle."""
+    return (phase + ticks - 1 - position) // cycle - (phase - 1 - position) // cycle
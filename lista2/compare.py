@@ -0,0 +1,146 @@
+"""
+Comparison of disk scheduling algorithms, every algorithm runs in its own process.
+Workers share the workload as memory mapped binary records file, only its name is sent to them.
+Results and errors of all algorithms are collected into one report.
+
+python compare.py --requests-file requests.bin --output comparison.json
+"""
+
+import os
+import json
+import time
+import pickle
+import logging
+import argparse
+import tempfile
+import concurrent.futures
+
+from main import Main, PICKLED_FILENAME, DISK_SIZE
+from disk_model import DiskModel
+from records import RequestRecords, write_records
+from utils import Logger
+
+ALGORITHMS = {
+    "FCFS": "run_fcfs",
+    "SSTF": "run_sstf",
+    "SCAN": "run_scan",
+    "C-SCAN": "run_c_scan",
+    "C-LOOK": "run_c_look",
+    "SSTF-EDF": "run_sstf_edf",
+    "SSTF-FDF-SCAN": "run_sstf_fdf_scan",
+    "SPTF": "run_sptf",
+}
+
+worker = None
+
+
+def init_worker(filename, timing=False):
+    """Keep workload in worker process for all its tasks.
+    Records stay memory mapped and requests are decoded when algorithms read them, disk size is the one
+    the workload was generated or converted for."""
+    global worker
+    logging.disable(logging.INFO)
+    records = RequestRecords(filename)
+    disk_size = records.params.get("disk_size", DISK_SIZE)
+    worker = Main(disk_size, model=DiskModel(disk_size) if timing else None)
+    worker.que = records
+
+
+def run_task(algorithm) -> dict:
+    start = time.perf_counter()
+    outcome = getattr(worker, ALGORITHMS[algorithm])().join()
+    elapsed = round(time.perf_counter() - start, 6)
+    if outcome["exit_code"] != 0:
+        return {"algorithm": algorithm, "status": "error", "wall_time": elapsed,
+                "error": outcome["traceback"]}
+    result = {"status": "ok", "wall_time": elapsed}
+    result.update(outcome["result"])
+    return result
+
+
+def run_comparison(requests, algorithms=None, workers=None, timing=False) -> list:
+    """Runs algorithms on requests in separate processes, returns results in order of algorithms.
+    Requests already loaded from binary records are shared through their file, others are written
+    to a temporary one. With timing accesses are timed by default disk model."""
+    algorithms = list(algorithms or ALGORITHMS)
+    workers = min(workers or os.cpu_count(), len(algorithms))
+    filename = requests.filename if isinstance(requests, RequestRecords) else None
+    temporary = None
+    if filename is None:
+        handle, temporary = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        write_records(temporary, requests)
+        filename = temporary
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                    initializer=init_worker,
+                                                    initargs=(filename, timing)) as executor:
+            futures = [executor.submit(run_task, algorithm) for algorithm in algorithms]
+            results = []
+            for algorithm, future in zip(algorithms, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # worker died or result could not be sent back
+                    results.append({"algorithm": algorithm, "status": "error", "wall_time": None,
+                                    "error": repr(e)})
+            return results
+    finally:
+        if temporary is not None:
+            os.remove(temporary)
+
+
+def format_report(results, wall_time=None) -> list:
+    """Returns lines of comparison table, algorithms ordered by average waiting time."""
+    lines = ["{:<14} {:>12} {:>10} {:>10} {:>12} {:>10}".format("Algorithm", "Avg wait", "p50", "p99",
+                                                              "Longest", "Time [s]")]
+    finished = sorted((result for result in results if result["status"] == "ok"),
+                      key=lambda result: result["average_waiting"])
+    for result in finished:
+        lines.append("{:<14} {:>12} {:>10} {:>10} {:>12} {:>10.3f}".format(
+            result["algorithm"], result["average_waiting"], result["waiting_percentiles"]["p50"],
+            result["waiting_percentiles"]["p99"], result["longest_waiting"], result["wall_time"]))
+        if "missed_deadlines" in result:
+            lines.append("{:<14} missed deadlines {} of {} ({}%)".format(
+                "", result["missed_deadlines"], result["real_time"], result["miss_rate"]))
+    for result in results:
+        if result["status"] != "ok":
+            lines.append("{:<14} failed: {}".format(result["algorithm"], result["error"].strip().splitlines()[-1]))
+    if wall_time is not None:
+        total = sum(result["wall_time"] or 0 for result in results)
+        lines.append("Finished in {:.3f} s, algorithms took {:.3f} s together".format(wall_time, total))
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare disk scheduling algorithms in parallel processes.")
+    parser.add_argument("--requests-file", default=PICKLED_FILENAME,
+                        help="binary records file (.bin) or pickled list of requests")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timing", action="store_true", help="time accesses with seek and rotation disk model")
+    parser.add_argument("--output", default=None, help="json file for results")
+    args = parser.parse_args()
+
+    log = Logger()
+    log.enable()
+    log.set_level(logging.INFO)
+    logger = logging.getLogger("COMPARE")
+
+    if args.requests_file.endswith(".bin"):
+        que = RequestRecords(args.requests_file)
+    else:
+        with open(args.requests_file, "rb") as file:
+            que = pickle.load(file)
+
+    logger.info("Running {} algorithms on {} requests".format(len(args.algorithms), len(que)))
+    started = time.perf_counter()
+    comparison = run_comparison(que, args.algorithms, args.workers, args.timing)
+    for line in format_report(comparison, time.perf_counter() - started):
+        logger.info(line)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(comparison, file, indent=2)
+        logger.info("Results saved to {}".format(args.output))
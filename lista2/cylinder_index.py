@@ -0,0 +1,119 @@
+import collections
+
+
+class CylinderIndex:
+    """Queued requests ordered by cylinder.
+
+    Requests of one cylinder are kept in queue order, non empty cylinders are counted in a Fenwick tree,
+    so the nearest non empty cylinder on either side of the head is found in O(log disk size).
+    Iterating over the index gives request indexes in queue order."""
+
+    def __init__(self, disk_size):
+        super(CylinderIndex, self).__init__()
+        self.size = disk_size + 1
+        self.tree = [0] * (self.size + 1)
+        self.top = 1 << (self.size.bit_length() - 1)
+        # cylinder -> deque of request indexes, only non empty cylinders are kept
+        self.buckets = {}
+        # request index -> (cylinder, queue order), dict keeps queue order
+        self.queued = {}
+        self.order = 0
+
+    def __len__(self):
+        return len(self.queued)
+
+    def __iter__(self):
+        return iter(self.queued)
+
+    def __contains__(self, index):
+        return index in self.queued
+
+    def update(self, cylinder, delta) -> None:
+        position = cylinder + 1
+        while position <= self.size:
+            self.tree[position] = self.tree[position] + delta
+            position = position + (position & -position)
+
+    def count_until(self, cylinder) -> int:
+        """Returns number of non empty cylinders up to cylinder, including it."""
+        position = min(cylinder + 1, self.size)
+        count = 0
+        while position > 0:
+            count = count + self.tree[position]
+            position = position - (position & -position)
+        return count
+
+    def find(self, rank) -> int:
+        """Returns rank-th non empty cylinder, counting from 1."""
+        position = 0
+        step = self.top
+        while step != 0:
+            if position + step <= self.size and self.tree[position + step] < rank:
+                position = position + step
+                rank = rank - self.tree[position]
+            step = step >> 1
+        return position
+
+    def add(self, index, cylinder) -> None:
+        if not 0 <= cylinder < self.size:
+            raise ValueError("Cylinder {} is outside of disk of size {}".format(cylinder, self.size - 1))
+        bucket = self.buckets.get(cylinder)
+        if bucket is None:
+            bucket = self.buckets[cylinder] = collections.deque()
+            self.update(cylinder, 1)
+        bucket.append(index)
+        self.queued[index] = (cylinder, self.order)
+        self.order = self.order + 1
+
+    def remove(self, index) -> None:
+        cylinder, _ = self.queued.pop(index)
+        bucket = self.buckets[cylinder]
+        if bucket[0] == index:
+            bucket.popleft()
+        else:
+            bucket.remove(index)
+        if len(bucket) == 0:
+            del self.buckets[cylinder]
+            self.update(cylinder, -1)
+
+    def nearest(self, position):
+        """Returns index of request closest to position, the one queued first on ties."""
+        if len(self.queued) == 0:
+            return None
+        below = self.count_until(position)
+        candidates = []
+        if below > 0:
+            candidates.append(self.buckets[self.find(below)][0])
+        if below < len(self.buckets):
+            candidates.append(self.buckets[self.find(below + 1)][0])
+        return min(candidates, key=lambda index: (abs(position - self.queued[index][0]), self.queued[index][1]))
+
+    def above(self, cylinder):
+        """Returns closest non empty cylinder above cylinder, None when there is none."""
+        rank = self.count_until(cylinder)
+        if rank < len(self.buckets):
+            return self.find(rank + 1)
+        return None
+
+    def below(self, cylinder):
+        """Returns closest non empty cylinder below cylinder, None when there is none."""
+        rank = self.count_until(cylinder - 1)
+        if rank > 0:
+            return self.find(rank)
+        return None
+
+    def pop_nearest(self, position):
+        index = self.nearest(position)
+        if index is not None:
+            self.remove(index)
+        return index
+
+    def pop_cylinder(self, cylinder) -> list:
+        """Removes all requests of cylinder, returns their indexes in queue order."""
+        bucket = self.buckets.pop(cylinder, None)
+        if bucket is None:
+            return []
+        self.update(cylinder, -1)
+        for index in bucket:
+            del self.queued[index]
+        return list(bucket)
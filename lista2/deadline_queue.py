@@ -0,0 +1,44 @@
+import heapq
+
+from metrics import Histogram
+
+
+class DeadlineQueue:
+    """Queued real time requests ordered by absolute deadline, arrive time plus deadline.
+
+    Requests with the same absolute deadline leave in order of their indexes, which is arrival order.
+    Served requests are checked against their deadlines, lateness of requests finished in time is 0."""
+
+    def __init__(self, requests):
+        super(DeadlineQueue, self).__init__()
+        self.requests = requests
+        self.heap = []
+        self.missed = 0
+        self.lateness = Histogram()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def deadline(self, index) -> int:
+        request = self.requests[index]
+        return request.arrive_time + request.deadline
+
+    def add(self, index) -> None:
+        heapq.heappush(self.heap, (self.deadline(index), index))
+
+    def pop(self) -> int:
+        """Removes request with the earliest deadline, returns its index."""
+        return heapq.heappop(self.heap)[1]
+
+    def record(self, index, finish_time) -> None:
+        """Checks deadline of request which was finished at finish time."""
+        lateness = finish_time - self.deadline(index)
+        if lateness > 0:
+            self.missed = self.missed + 1
+        self.lateness.record(max(lateness, 0), index)
+
+    def miss_rate(self) -> float:
+        """Returns percent of served real time requests which missed their deadlines."""
+        if len(self.lateness) == 0:
+            return 0.0
+        return round(100 * self.missed / len(self.lateness), 2)
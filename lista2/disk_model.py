@@ -0,0 +1,83 @@
+"""
+Disk timing model, time of one access is seek, rotational latency and transfer, all in ticks.
+Seek times of every distance and start angles of every sector are computed once into lookup tables,
+so timing of an access is a few table lookups.
+"""
+
+import math
+
+# seek to the neighbouring cylinder, settle time included
+TRACK_SEEK = 50
+# seeks shorter than this many cylinders follow square root curve, longer ones are linear
+SHORT_SEEK = 1000
+# time of seek over SHORT_SEEK cylinders
+SHORT_SEEK_TIME = 1800
+# long seeks take this much more time for every next cylinder
+CYLINDER_TIME = 0.8
+# time of one revolution of the platter
+ROTATION = 2000
+SECTORS = 64
+# sectors read or written by one request
+TRANSFER_SECTORS = 1
+# spreads sectors of requests which do not have one, Knuth multiplicative hash
+SECTOR_HASH = 2654435761
+
+
+class DiskModel:
+    """Access timing of disk with disk_size + 1 cylinders.
+
+    Seek time is TRACK_SEEK for one cylinder and grows with square root of distance up to SHORT_SEEK cylinders,
+    then linearly by CYLINDER_TIME per cylinder. Platter angle at time t is t % rotation,
+    request waits until start of its sector comes under the head. Requests without sector attribute
+    get sector derived from their id."""
+
+    def __init__(self, disk_size, track_seek=TRACK_SEEK, short_seek=SHORT_SEEK, short_seek_time=SHORT_SEEK_TIME,
+                 cylinder_time=CYLINDER_TIME, rotation=ROTATION, sectors=SECTORS, transfer_sectors=TRANSFER_SECTORS):
+        super(DiskModel, self).__init__()
+        if short_seek < 2 or short_seek_time < track_seek:
+            raise ValueError("Short seek must be longer than one cylinder and take at least track seek time")
+        if rotation < 1 or sectors < 1:
+            raise ValueError("Disk needs positive rotation time and sector count")
+        self.disk_size = disk_size
+        # square root curve going through (1, track_seek) and (short_seek, short_seek_time)
+        slope = (short_seek_time - track_seek) / (math.sqrt(short_seek) - 1)
+        self.seek_table = [0] + [round(track_seek + slope * (math.sqrt(distance) - 1)) if distance < short_seek
+                                 else round(short_seek_time + cylinder_time * (distance - short_seek))
+                                 for distance in range(1, disk_size + 1)]
+        self.rotation = rotation
+        self.sectors = sectors
+        self.sector_angle = [sector * rotation // sectors for sector in range(sectors)]
+        self.transfer_time = transfer_sectors * rotation // sectors
+        check_seek_table(self.seek_table)
+
+    @classmethod
+    def linear(cls, disk_size):
+        """Model of the simulation without timing, one tick per cylinder, no rotation or transfer."""
+        model = cls(disk_size, rotation=1, sectors=1, transfer_sectors=0)
+        model.seek_table = list(range(disk_size + 1))
+        return model
+
+    def seek_time(self, distance) -> int:
+        return self.seek_table[distance]
+
+    def sector(self, request) -> int:
+        sector = getattr(request, "sector", None)
+        if sector is None:
+            return request.request_id * SECTOR_HASH % self.sectors
+        return sector
+
+    def positioning_time(self, position, request, time) -> int:
+        """Returns time from now until head is over the first sector of request."""
+        seek = self.seek_table[abs(position - request.cylinder)]
+        return seek + (self.sector_angle[self.sector(request)] - time - seek) % self.rotation
+
+    def access_time(self, position, request, time) -> int:
+        return self.positioning_time(position, request, time) + self.transfer_time
+
+
+def check_seek_table(seek_table) -> None:
+    """Shortest positioning time search stops at the first cylinder whose seek alone is too long,
+    so seek time must not drop with distance."""
+    for distance in range(1, len(seek_table)):
+        if seek_table[distance] < seek_table[distance - 1]:
+            raise ValueError("Seek over {} cylinders is faster than over {}".format(distance, distance - 1))
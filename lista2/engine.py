@@ -0,0 +1,180 @@
+"""
+Headless disk scheduling engine shared by console and GUI versions.
+Engine keeps the head, the clocks, arrivals and queue of requests. Policy object decides what the head does
+in every step, observers are told about every arrival, served request and head move.
+
+engine = Engine(requests, SSTFPolicy(requests), disk_size, start_pos, observers=[observer])
+while engine.step():
+    pass
+engine.report("SSTF")
+"""
+
+import logging
+
+from request import RequestState
+from arrivals import ArrivalFeeder
+from metrics import Histogram
+from disk_model import DiskModel
+
+# logged under the name of algorithm in its report
+DESCRIPTIONS = {
+    "SSTF": "High starvation rate for requests on \"edges\" of disk.",
+    "SSTF-EDF": "Switches to FCFS if real time requests arrive.",
+    "SSTF-FDF-SCAN": "Switches to SCAN if real time requests arrive.",
+}
+
+
+class Observer:
+    """Listener of engine events, requests are given by their indexes in workload."""
+
+    def queued(self, engine, index) -> None:
+        """Called when request arrives."""
+
+    def served(self, engine, index) -> None:
+        """Called when request stops waiting, head goes to its cylinder or is over it already."""
+
+    def moved(self, engine) -> None:
+        """Called when time went forward, head may be on another position."""
+
+
+class Engine:
+    """One run of requests sorted by arrive time on disk with disk_size + 1 cylinders.
+
+    Policies move time straight to the next event, never tick by tick. Time decides arrivals and finish times,
+    wait clock is time in which queued requests wait and policy decides how it goes with time.
+    Without timing model moving over one cylinder takes one tick and nothing else takes time."""
+
+    def __init__(self, requests, policy, disk_size, start_pos, model=None, state=None, observers=()):
+        super(Engine, self).__init__()
+        self.requests = requests
+        self.policy = policy
+        self.disk_size = disk_size
+        self.timed = model is not None
+        self.model = DiskModel.linear(disk_size) if model is None else model
+        self.state = RequestState() if state is None else state
+        self.observers = list(observers)
+        # workloads stored as columns give arrive times and cylinders without decoding requests
+        self.arrivals = ArrivalFeeder(requests, getattr(requests, "arrive_times", None))
+        self.cylinders = getattr(requests, "cylinders", None)
+        self.queue = policy.create_queue(disk_size)
+        self.wait_times = Histogram()
+        self.position = start_pos
+        self.time = 0
+        # total time every queued request waited
+        self.clock = 0
+        policy.start(self)
+
+    @property
+    def finished(self) -> bool:
+        return len(self.arrivals) == 0 and len(self.queue) == 0
+
+    def step(self) -> bool:
+        """Runs one decision of policy, returns False when every request was served."""
+        self.policy.step(self)
+        return not self.finished
+
+    def run(self) -> Histogram:
+        while self.step():
+            pass
+        return self.wait_times
+
+    def skip_idle(self) -> None:
+        """Disk is idle when nothing is queued, time jumps straight to the next arrival."""
+        if len(self.queue) == 0 and len(self.arrivals) != 0:
+            self.time = max(self.time, self.arrivals.next_arrival_time())
+
+    def admit(self) -> None:
+        """Queues requests arrived until now."""
+        for index in self.arrivals.pop_arrived(self.time):
+            self.queue.add(index, self.cylinder(index))
+            self.state.set_queue_time(index, self.clock)
+            self.policy.queued(index)
+            for observer in self.observers:
+                observer.queued(self, index)
+
+    def cylinder(self, index) -> int:
+        if self.cylinders is not None:
+            return self.cylinders[index]
+        return self.requests[index].cylinder
+
+    def until_arrival(self, ticks):
+        """Returns ticks cut down to the next arrival, so no arrival is jumped over."""
+        if len(self.arrivals) != 0:
+            until_arrival = self.arrivals.next_arrival_time() - self.time
+            ticks = until_arrival if ticks is None else min(ticks, until_arrival)
+        return ticks
+
+    def advance(self, ticks, position, waited=None) -> None:
+        """Moves time by ticks and head to position, queued requests wait all ticks unless waited is given."""
+        self.time = self.time + ticks
+        self.clock = self.clock + (ticks if waited is None else waited)
+        self.position = position
+        for observer in self.observers:
+            observer.moved(self)
+
+    def stop_waiting(self, index) -> None:
+        self.wait_times.record(self.state.set_serve_time(index, self.clock), index)
+        for observer in self.observers:
+            observer.served(self, index)
+
+    def finish(self, index) -> None:
+        self.state.set_finish_time(index, self.time)
+        self.policy.served(index, self.time)
+
+    def serve(self, index) -> None:
+        """Serves queued request on cylinder under the head."""
+        self.queue.remove(index)
+        self.stop_waiting(index)
+        self.finish(index)
+
+    def serve_cylinder(self) -> None:
+        """Serves all requests on cylinder under the head."""
+        for index in self.queue.pop_cylinder(self.position):
+            self.stop_waiting(index)
+            self.finish(index)
+
+    def access(self, index, via=()) -> None:
+        """Serves queued request, head seeks through via positions to its cylinder and accesses it."""
+        cylinder = self.cylinder(index)
+        self.queue.remove(index)
+        self.stop_waiting(index)
+        for position in via:
+            self.advance(self.model.seek_time(abs(self.position - position)), position)
+        if self.timed:
+            self.advance(self.model.access_time(self.position, self.requests[index], self.time), cylinder)
+        else:
+            self.advance(abs(self.position - cylinder), cylinder)
+        self.finish(index)
+
+    def report(self, name) -> dict:
+        """Logs and returns results of the run under name of algorithm."""
+        logger = logging.getLogger(name)
+        wait_times = self.wait_times
+        deadlines = getattr(self.policy, "deadlines", None)
+        longest = wait_times.max_item
+        longest_waiting = self.requests[longest]
+        logger.info("================= {} =================".format(name))
+        if name in DESCRIPTIONS:
+            logger.info(DESCRIPTIONS[name])
+        logger.info("Average waiting time: {}".format(round(wait_times.mean(), 2)))
+        logger.info("Waiting time percentiles: {}".format(wait_times.describe()))
+        longest_line = "Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".format(
+            longest_waiting.request_id, wait_times.max, longest_waiting.cylinder,
+            longest_waiting.arrive_time)
+        if self.policy.real_time:
+            longest_line = longest_line + ", Real-time: {}".format(longest_waiting.real_time)
+        logger.info(longest_line)
+        result = {"algorithm": name,
+                  "average_waiting": round(wait_times.mean(), 2),
+                  "longest_waiting": wait_times.max,
+                  "longest_waiting_id": longest_waiting.request_id,
+                  "waiting_percentiles": wait_times.percentiles()}
+        if deadlines is not None:
+            logger.info("Real time requests: {}, Missed deadlines: {}, Miss rate: {}%".format(
+                len(deadlines.lateness), deadlines.missed, deadlines.miss_rate()))
+            logger.info("Lateness percentiles: {}".format(deadlines.lateness.describe()))
+            result.update({"real_time": len(deadlines.lateness),
+                           "missed_deadlines": deadlines.missed,
+                           "miss_rate": deadlines.miss_rate(),
+                           "lateness_percentiles": deadlines.lateness.percentiles()})
+        return result
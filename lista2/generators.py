@@ -0,0 +1,41 @@
+"""
+Seeded workload generators.
+Requests are produced in arrival order, in chunks, without building the whole workload.
+Same seed and chunk size always give the same requests.
+"""
+
+import numpy as np
+
+from request import Request
+
+CHUNK_SIZE = 65536
+
+
+def generate_requests(requests_count, real_time_count, disk_size, min_arrive_time, max_arrive_time,
+                      min_deadline, max_deadline, seed=None, chunk_size=CHUNK_SIZE, request_class=Request):
+    """Yields lists of requests sorted by arrive time, ids follow arrival order starting from 1.
+    Requests arriving at the same time are ordered normal first, then real time."""
+    rng = np.random.default_rng(seed)
+    slots = max_arrive_time - min_arrive_time + 1
+    normal = rng.multinomial(max(requests_count - real_time_count, 0), np.full(slots, 1 / slots))
+    real_time = rng.multinomial(real_time_count, np.full(slots, 1 / slots))
+    arrivals = np.cumsum(normal + real_time)
+    count = int(arrivals[-1])
+
+    for start in range(0, count, chunk_size):
+        index = np.arange(start, min(start + chunk_size, count))
+        slot = np.searchsorted(arrivals, index, side="right")
+        # position inside the slot decides whether request is one of its real time ones
+        is_real_time = index - (arrivals[slot] - normal[slot] - real_time[slot]) >= normal[slot]
+        cylinders = rng.integers(0, disk_size + 1, len(index))
+        deadlines = np.where(is_real_time, rng.integers(min_deadline, max_deadline + 1, len(index)), 0)
+
+        chunk = []
+        for request_id, arrive_time, cylinder, rt, deadline in zip((index + 1).tolist(),
+                                                                  (slot + min_arrive_time).tolist(),
+                                                                  cylinders.tolist(), is_real_time.tolist(),
+                                                                  deadlines.tolist()):
+            request = request_class(arrive_time, cylinder, real_time=rt, deadline=deadline)
+            request.set_id(request_id)
+            chunk.append(request)
+        yield chunk
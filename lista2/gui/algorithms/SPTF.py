@@ -0,0 +1,11 @@
+from policies import SPTFPolicy
+
+from gui.models.Algorithm import QAlgorithm
+
+
+class SPTF(QAlgorithm):
+    name = "SPTF"
+
+    def policy(self):
+        # without timing model positioning time is the distance, so SPTF serves like SSTF
+        return SPTFPolicy(self.que)
@@ -5,3 +5,4 @@ from .C_SCAN import C_SCAN
 from .C_LOOK import C_LOOK
 from .SSTF_EDF import SSTF_EDF
 from .SSTF_FDF_SCAN import SSTF_FDF_SCAN
+from .SPTF import SPTF
@@ -1,18 +1,52 @@
-from qtpy.QtCore import QObject, Signal, Slot
+from qtpy.QtCore import QObject, QThread, Signal, Slot
+
+from engine import Engine
+
+# pause after every change shown on disk, in ms
+STEP_DELAY = 100
 
 
 class QAlgorithm(QObject):
-    """Runnable algorithm object."""
+    """Runnable algorithm object, shows requests and head of engine run on disk."""
+    # name of algorithm in logs
+    name = None
 
-    def __init__(self):
+    def __init__(self, que=None, start_pos=0, disk_size=0, model=None):
         super(QAlgorithm, self).__init__(parent=None)
-        self.que = []
+        self.que = [] if que is None else que
+        self.start_pos = start_pos
+        self.disk_size = disk_size
+        # disk timing model, without it moving over one cylinder takes one tick and nothing else takes time
+        self.model = model
         self.disk = []
         self.head_pos = 0
 
+    def policy(self):
+        raise NotImplementedError
+
     @Slot()
     def run(self):
-        pass
+        """Runs requests on shared engine step by step, logs results."""
+        engine = Engine(self.que, self.policy(), self.disk_size, self.start_pos, model=self.model, observers=[self])
+        self.setHeadPos(self.start_pos)
+        while engine.step():
+            pass
+        return engine.report(self.name)
+
+    def queued(self, engine, index):
+        self.addRequest(engine.requests[index].cylinder)
+
+    def served(self, engine, index):
+        QThread.msleep(STEP_DELAY)
+        self.removeRequest(engine.requests[index].cylinder)
+
+    def moved(self, engine):
+        QThread.msleep(STEP_DELAY)
+        self.setHeadPos(engine.position)
+
+    @Slot(object)
+    def setModel(self, model):
+        self.model = model
 
     @Slot(int)
     def setDiskSize(self, size):
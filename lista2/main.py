@@ -3,18 +3,24 @@ Simulation for disk scheduling algorithms.
 One tick = moved over one cylinder.
 """
 
-import copy
 import pickle
-import random
 import logging
-import operator
-import collections
+import itertools
+
+import numpy as np
 
 from utils import Logger, threaded
-from request import Request
+from metrics import Histogram
+from records import RequestRecords, write_records
+from batch import RequestBatch
+from generators import generate_requests
+from engine import Engine
+from policies import (FCFSPolicy, SSTFPolicy, ScanPolicy, CScanPolicy, CLookPolicy, EDFPolicy, FDFScanPolicy,
+                      SPTFPolicy)
 
 LOGGING_LEVEL = logging.INFO
 PICKLED_FILENAME = "requests.pick"
+BINARY_FILENAME = "requests.bin"
 
 START_POS = 0
 DISK_SIZE = 5000
@@ -29,24 +35,20 @@ MAX_DEADLINE = 500
 
 
 class Main:
-    def __init__(self):
+    def __init__(self, disk_size=None, start_pos=None, model=None):
         super(Main, self).__init__()
         self.que = []
+        self.disk_size = DISK_SIZE if disk_size is None else disk_size
+        self.start_pos = START_POS if start_pos is None else start_pos
+        # disk timing model, without it moving over one cylinder takes one tick and nothing else takes time
+        self.model = model
 
-    def create_requests(self) -> None:
+    def create_requests(self, seed=None, requests_count=REQUESTS_COUNT, real_time_count=REAL_TIME_COUNT,
+                        max_arrive_time=MAX_ARRIVE_TIME) -> None:
         """Fills queue with disk access requests."""
-        for x in range(REQUESTS_COUNT - REAL_TIME_COUNT):
-            self.que.append(Request(random.randint(MIN_ARRIVE_TIME, MAX_ARRIVE_TIME),
-                                    random.randint(0, DISK_SIZE)))
-
-        for x in range(REAL_TIME_COUNT):
-            self.que.append(Request(random.randint(MIN_ARRIVE_TIME, MAX_ARRIVE_TIME),
-                                    random.randint(0, DISK_SIZE),
-                                    real_time=True, deadline=random.randint(MIN_DEADLINE, MAX_DEADLINE)))
-
-        self.que.sort(key=lambda req: req.arrive_time)
-        for index, request in enumerate(self.que):
-            request.set_id(index + 1)
+        for chunk in generate_requests(requests_count, real_time_count, self.disk_size, MIN_ARRIVE_TIME,
+                                       max_arrive_time, MIN_DEADLINE, MAX_DEADLINE, seed=seed):
+            self.que.extend(chunk)
 
     def save_processes_to_file(self) -> None:
         """Saves requests to file using pickle."""
@@ -58,384 +60,134 @@ class Main:
         with open(PICKLED_FILENAME, "rb") as file:
             self.que = pickle.load(file)
 
+    def save_processes_to_binary(self) -> None:
+        """Saves requests to binary records file."""
+        write_records(BINARY_FILENAME, self.que, {"disk_size": self.disk_size,
+                                                  "requests_count": REQUESTS_COUNT,
+                                                  "real_time_count": REAL_TIME_COUNT,
+                                                  "min_arrive_time": MIN_ARRIVE_TIME,
+                                                  "max_arrive_time": MAX_ARRIVE_TIME,
+                                                  "min_deadline": MIN_DEADLINE,
+                                                  "max_deadline": MAX_DEADLINE})
+
+    def load_processes_from_binary(self) -> None:
+        """Load requests from memory mapped binary records file."""
+        self.que = RequestRecords(BINARY_FILENAME)
+
+    def stream_requests_to_binary(self, requests_count, real_time_count, seed=None) -> None:
+        """Generates requests straight to binary file, only one chunk is kept in memory."""
+        write_records(BINARY_FILENAME,
+                      itertools.chain.from_iterable(generate_requests(requests_count, real_time_count, self.disk_size,
+                                                                      MIN_ARRIVE_TIME, MAX_ARRIVE_TIME,
+                                                                      MIN_DEADLINE, MAX_DEADLINE, seed=seed)),
+                      {"disk_size": self.disk_size,
+                       "requests_count": requests_count,
+                       "real_time_count": real_time_count,
+                       "min_arrive_time": MIN_ARRIVE_TIME,
+                       "max_arrive_time": MAX_ARRIVE_TIME,
+                       "min_deadline": MIN_DEADLINE,
+                       "max_deadline": MAX_DEADLINE,
+                       "seed": seed})
+
+    def simulate(self, name, policy, state=None) -> dict:
+        """Runs requests with policy on shared engine, logs and returns results."""
+        engine = Engine(self.que, policy, self.disk_size, self.start_pos, self.model, state)
+        engine.run()
+        return engine.report(name)
+
     @threaded
-    def run_fcfs(self):
-        logger = logging.getLogger("FCFS")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = incomming[0].arrive_time
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    incomming.remove(request)
-                    queue.append(request)
-
-            if len(queue) != 0:
-                request = queue.popleft()
-                # processes are sorted by arrive time so we do not have search for min
-                # request: Request = min(queue, key=operator.attrgetter("arrive_time"))
-                # queue.remove(request)
-                completed.append(request)
-
-                # calculate delta of head position and add it to time
-                delta = abs(current_pos - request.cylinder)
-                current_pos = request.cylinder
-                time = time + delta
-
-                for other in list(queue):
-                    other.add_wait_time(delta)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= FCFS =================")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time))
+    def run_fcfs(self, state=None):
+        return self.simulate("FCFS", FCFSPolicy(self.que), state)
 
     @threaded
-    def run_sstf(self):
-        logger = logging.getLogger("SSTF")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = incomming[0].arrive_time
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            if len(queue) != 0:
-                nearest: Request = min(queue, key=lambda req: abs(current_pos - req.cylinder))
-                queue.remove(nearest)
-                completed.append(nearest)
-
-                # calculate delta of head position and add it to time
-                delta = abs(current_pos - nearest.cylinder)
-                current_pos = nearest.cylinder
-                time = time + delta
-
-                for other in list(queue):
-                    other.add_wait_time(delta)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= SSTF =================")
-        logger.info("High starvation rate for requests on \"edges\" of disk.")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time))
+    def run_sstf(self, state=None):
+        return self.simulate("SSTF", SSTFPolicy(self.que), state)
 
     @threaded
-    def run_scan(self):
-        logger = logging.getLogger("SCAN")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        # check on which side first request is
-        # to_right = True
-        to_right = incomming[0].cylinder >= current_pos
-        time = 0
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            # decrease disc size and max arrive time to generate more interesting results
-            for request_in_cylinder in [req for req in queue if req.cylinder == current_pos]:
-                logger.debug("Request {} scaned on pos {}".format(request_in_cylinder.request_id,
-                                                                  request_in_cylinder.cylinder))
-                queue.remove(request_in_cylinder)
-                completed.append(request_in_cylinder)
-
-            time = time + 1
-            if to_right:
-                if current_pos == DISK_SIZE:
-                    to_right = False
-                else:
-                    current_pos = current_pos + 1
-            else:
-                if current_pos == 0:
-                    to_right = True
-                else:
-                    current_pos = current_pos - 1
-
-            for other in list(queue):
-                other.add_wait_time(1)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= SCAN =================")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time))
+    def run_scan(self, state=None):
+        return self.simulate("SCAN", ScanPolicy(self.que, self.disk_size), state)
 
     @threaded
-    def run_c_scan(self):
-        logger = logging.getLogger("C-SCAN")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = 0
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            for request_in_cylinder in [req for req in queue if req.cylinder == current_pos]:
-                logger.debug("Request {} scaned on pos {}".format(request_in_cylinder.request_id,
-                                                                  request_in_cylinder.cylinder))
-                queue.remove(request_in_cylinder)
-                completed.append(request_in_cylinder)
-
-            time = time + 1
-            if current_pos == DISK_SIZE:
-                # time = time + current_pos
-                current_pos = 0
-            else:
-                current_pos = current_pos + 1
-
-            for other in list(queue):
-                other.add_wait_time(1)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= C-SCAN =================")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time))
+    def run_c_scan(self, state=None):
+        return self.simulate("C-SCAN", CScanPolicy(self.que, self.disk_size), state)
+
+    @threaded
+    def run_c_look(self, state=None):
+        return self.simulate("C-LOOK", CLookPolicy(self.que), state)
+
+    @threaded
+    def run_sstf_edf(self, state=None):
+        return self.simulate("SSTF-EDF", EDFPolicy(self.que), state)
+
+    @threaded
+    def run_sstf_fdf_scan(self, state=None):
+        return self.simulate("SSTF-FDF-SCAN", FDFScanPolicy(self.que), state)
 
     @threaded
-    def run_c_look(self):
-        logger = logging.getLogger("C-LOOK")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = 0
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            for request_in_cylinder in [req for req in queue if req.cylinder == current_pos]:
-                logger.debug("Request {} scaned on pos {}".format(request_in_cylinder.request_id,
-                                                                  request_in_cylinder.cylinder))
-                queue.remove(request_in_cylinder)
-                completed.append(request_in_cylinder)
-
-            time = time + 1
-            if current_pos == DISK_SIZE:
-                requests_cylinders = [req.cylinder for req in queue]
-                if requests_cylinders:
-                    current_pos = min(requests_cylinders)
-                else:
-                    current_pos = 0
-                logger.debug("Going back to pos {}".format(current_pos))
-            else:
-                if len([req for req in queue if req.cylinder in range(current_pos, DISK_SIZE + 1)]) == 0:
-                    current_pos = DISK_SIZE
-                else:
-                    current_pos = current_pos + 1
-                    for other in list(queue):
-                        other.add_wait_time(1)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= C-LOOK =================")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
+    def run_sptf(self, state=None):
+        # without timing model positioning time is the distance, so SPTF serves like SSTF
+        return self.simulate("SPTF", SPTFPolicy(self.que), state)
+
+    def load_batch(self) -> RequestBatch:
+        if isinstance(self.que, RequestRecords):
+            return RequestBatch.from_records(self.que)
+        return RequestBatch.from_requests(self.que)
+
+    def report_batch(self, name, batch) -> dict:
+        """Logs and returns results of evaluated batch like step by step runs do."""
+        logger = logging.getLogger(name)
+        wait_times = Histogram()
+        for value, count in zip(*np.unique(batch.wait_time, return_counts=True)):
+            wait_times.record(int(value), count=int(count))
+        # longest waiting request is the first one served with the maximum waiting time
+        longest = int(batch.order[np.argmax(batch.wait_time[batch.order])])
+        logger.info("================= {} =================".format(name))
+        logger.info("Average waiting time: {}".format(round(wait_times.mean(), 2)))
+        logger.info("Waiting time percentiles: {}".format(wait_times.describe()))
         logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time))
+                    format(int(batch.id[longest]),
+                           int(batch.wait_time[longest]),
+                           int(batch.cylinder[longest]),
+                           int(batch.arrive_time[longest])))
+        logger.info("Total head movement: {}".format(batch.head_movement))
+        return {"algorithm": name,
+                "average_waiting": round(wait_times.mean(), 2),
+                "longest_waiting": int(batch.wait_time[longest]),
+                "longest_waiting_id": int(batch.id[longest]),
+                "waiting_percentiles": wait_times.percentiles(),
+                "head_movement": batch.head_movement}
+
+    @threaded
+    def run_fcfs_vectorized(self):
+        batch = self.load_batch()
+        if not batch.evaluate_fcfs(self.start_pos):
+            logging.getLogger("FCFS").info("Requests arrive after start, falling back to step by step FCFS")
+            return self.run_fcfs.__wrapped__(self)
+        return self.report_batch("FCFS", batch)
+
+    @threaded
+    def run_scan_vectorized(self):
+        batch = self.load_batch()
+        if not batch.evaluate_scan(self.start_pos, self.disk_size):
+            logging.getLogger("SCAN").info("Requests arrive after start, falling back to step by step SCAN")
+            return self.run_scan.__wrapped__(self)
+        return self.report_batch("SCAN", batch)
 
     @threaded
-    def run_sstf_edf(self):
-        logger = logging.getLogger("SSTF-EDF")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = incomming[0].arrive_time
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            if len(queue) != 0:
-                # check for real time requests
-                real_time = [req for req in queue if req.real_time]
-                if len(real_time) > 0:
-                    # find shortest real time request
-                    nearest = min(real_time, key=operator.attrgetter("deadline"))
-                else:
-                    # fallback to sstf
-                    nearest: Request = min(queue, key=lambda req: abs(current_pos - req.cylinder))
-
-                queue.remove(nearest)
-                completed.append(nearest)
-
-                # calculate delta of head position and add it to time
-                delta = abs(current_pos - nearest.cylinder)
-                current_pos = nearest.cylinder
-                time = time + delta
-
-                for other in list(queue):
-                    other.add_wait_time(delta)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= SSTF-EDF =================")
-        logger.info("Switches to FCFS if real time requests arrive.")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}, Real-time: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time,
-                           longest_waiting.real_time))
+    def run_c_scan_vectorized(self):
+        batch = self.load_batch()
+        if not batch.evaluate_c_scan(self.start_pos, self.disk_size):
+            logging.getLogger("C-SCAN").info("Requests arrive after start, falling back to step by step C-SCAN")
+            return self.run_c_scan.__wrapped__(self)
+        return self.report_batch("C-SCAN", batch)
 
     @threaded
-    def run_sstf_fdf_scan(self):
-        logger = logging.getLogger("SSTF-FDF-SCAN")
-        incomming = collections.deque(copy.deepcopy(self.que))
-        queue = collections.deque()
-        completed = collections.deque()
-        current_pos = START_POS
-        time = incomming[0].arrive_time
-        target = None
-
-        while True:
-            for request in list(incomming):
-                if request.arrive_time <= time:
-                    queue.append(request)
-                    incomming.remove(request)
-
-            logger.debug("POS: {} QUEUE: {}".format(current_pos, [str(req.cylinder) + "*" if req.real_time
-                                                                  else str(req.cylinder) for req in queue]))
-            if len(queue) != 0:
-                if target:
-                    if target.cylinder == current_pos:
-                        logger.debug("Head over target cylinder {}".format(current_pos))
-                        queue.remove(target)
-                        completed.append(target)
-                        target = None
-                    else:
-                        for request_in_cylinder in [req for req in queue if req.cylinder == current_pos]:
-                            logger.debug("Request {} scaned on pos {}".format(request_in_cylinder.request_id,
-                                                                              request_in_cylinder.cylinder))
-                            queue.remove(request_in_cylinder)
-                            completed.append(request_in_cylinder)
-
-                        time = time + 1
-                        if current_pos < target.cylinder:
-                            current_pos = current_pos + 1
-                        else:
-                            current_pos = current_pos - 1
-                        time = time + 1
-                        for other in list(queue):
-                            other.add_wait_time(1)
-
-                else:
-                    # no target, check for new real time requests
-                    real_time = [req for req in queue if req.real_time]
-                    if len(real_time) > 0:
-                        nearest_realtime: Request = min(real_time, key=operator.attrgetter("deadline"))
-                        if nearest_realtime.deadline >= abs(current_pos - nearest_realtime.cylinder):
-                            target = nearest_realtime
-                            logger.debug("Target set to request {}, Deadline {} >= Delta pos {}"
-                                         .format(nearest_realtime.cylinder, nearest_realtime.deadline,
-                                                 abs(current_pos - nearest_realtime.cylinder)))
-                        else:
-                            # request too far, fallback to sstf
-                            logger.debug("Not worth to process request {}, Deadline: {} < Delta pos {}"
-                                         .format(nearest_realtime.cylinder, nearest_realtime.deadline,
-                                                 abs(current_pos - nearest_realtime.cylinder)))
-                            nearest: Request = min(queue, key=lambda req: abs(current_pos - req.cylinder))
-                            queue.remove(nearest)
-                            completed.append(nearest)
-
-                            # calculate delta of head position and add it to time
-                            delta = abs(current_pos - nearest.cylinder)
-                            current_pos = nearest.cylinder
-                            time = time + delta
-
-                            for other in list(queue):
-                                other.add_wait_time(delta)
-                    else:
-                        # no real time requests, fallback to sstf
-                        nearest: Request = min(queue, key=lambda req: abs(current_pos - req.cylinder))
-                        queue.remove(nearest)
-                        completed.append(nearest)
-
-                        # calculate delta of head position and add it to time
-                        delta = abs(current_pos - nearest.cylinder)
-                        current_pos = nearest.cylinder
-                        time = time + delta
-
-                        for other in list(queue):
-                            other.add_wait_time(delta)
-
-            if len(incomming) == 0 and len(queue) == 0:
-                break
-
-        longest_waiting = max(completed, key=operator.attrgetter("wait_time"))
-        logger.info("================= SSTF-FDF-SCAN =================")
-        logger.info("Switches to SCAN if real time requests arrive.")
-        logger.info("Average waiting time: {}".format(round(sum(req.wait_time for req in completed) /
-                                                            len(completed), 2)))
-        logger.info("Request with longest waiting time ID: {}, Time: {}, Cylinder: {}, Arrived: {}, Real-time: {}".
-                    format(longest_waiting.request_id,
-                           longest_waiting.wait_time,
-                           longest_waiting.cylinder,
-                           longest_waiting.arrive_time,
-                           longest_waiting.real_time))
+    def run_c_look_vectorized(self):
+        batch = self.load_batch()
+        if not batch.evaluate_c_look(self.start_pos, self.disk_size):
+            logging.getLogger("C-LOOK").info("Requests arrive after start, falling back to step by step C-LOOK")
+            return self.run_c_look.__wrapped__(self)
+        return self.report_batch("C-LOOK", batch)
 
 
 if __name__ == '__main__':
@@ -456,7 +208,7 @@ if __name__ == '__main__':
 
     threads = []
     for attr in dir(m):
-        if attr.startswith("run"):
+        if attr.startswith("run") and not attr.endswith("_vectorized"):
             threads.append(getattr(m, attr)())
 
     for thread in threads:
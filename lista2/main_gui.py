@@ -3,7 +3,6 @@ from qtpy.QtCore import Qt, qInstallMessageHandler
 
 import sys
 import pickle
-import random
 import logging
 import traceback
 
@@ -17,9 +16,12 @@ from gui.widgets.MainWidget import MainWidget
 from gui.widgets.AlgorithmsTable import AlgorithmsTable
 from gui.models.Request import Request
 from gui.models.AlgorithmsTableModel import AlgorithmsTableModel
+from records import RequestRecords, write_records
+from generators import generate_requests
 
 LOGGING_LEVEL = logging.INFO
 PICKLED_FILENAME = "requests.pick"
+BINARY_FILENAME = "requests.bin"
 
 START_POS = 0
 DISK_SIZE = 200
@@ -38,7 +40,9 @@ class MainWindow(FramelessWindow):
     def __init__(self):
         super(MainWindow, self).__init__()
         self.que = []
-        self.algorithms = [FCFS, SSTF, SCAN, C_SCAN, C_LOOK, SSTF_EDF, SSTF_FDF_SCAN]
+        self.algorithms = [FCFS, SSTF, SCAN, C_SCAN, C_LOOK, SSTF_EDF, SSTF_FDF_SCAN, SPTF]
+        # disk timing model given to every algorithm, None moves head by one cylinder per tick
+        self.model = None
 
         self.menu = QMenu(self)
         self.style_picker_action = QWidgetAction(self.menu)
@@ -51,20 +55,11 @@ class MainWindow(FramelessWindow):
         self.main_widget = MainWidget(self)
         self.addContentWidget(self.main_widget)
 
-    def createRequests(self) -> None:
+    def createRequests(self, seed=None) -> None:
         """Fills queue with disk access requests."""
-        for x in range(REQUESTS_COUNT - REAL_TIME_COUNT):
-            self.que.append(Request(random.randint(MIN_ARRIVE_TIME, MAX_ARRIVE_TIME),
-                                    random.randint(0, DISK_SIZE)))
-
-        for x in range(REAL_TIME_COUNT):
-            self.que.append(Request(random.randint(MIN_ARRIVE_TIME, MAX_ARRIVE_TIME),
-                                    random.randint(0, DISK_SIZE),
-                                    real_time=True, deadline=random.randint(MIN_DEADLINE, MAX_DEADLINE)))
-
-        self.que.sort(key=lambda req: req.arrive_time)
-        for index, request in enumerate(self.que):
-            request.set_id(index + 1)
+        for chunk in generate_requests(REQUESTS_COUNT, REAL_TIME_COUNT, DISK_SIZE, MIN_ARRIVE_TIME, MAX_ARRIVE_TIME,
+                                       MIN_DEADLINE, MAX_DEADLINE, seed=seed, request_class=Request):
+            self.que.extend(chunk)
 
     def saveProcessesToFile(self) -> None:
         """Saves requests to file using pickle."""
@@ -76,6 +71,20 @@ class MainWindow(FramelessWindow):
         with open(PICKLED_FILENAME, "rb") as file:
             self.que = pickle.load(file)
 
+    def saveProcessesToBinary(self) -> None:
+        """Saves requests to binary records file."""
+        write_records(BINARY_FILENAME, self.que, {"disk_size": DISK_SIZE,
+                                                  "requests_count": REQUESTS_COUNT,
+                                                  "real_time_count": REAL_TIME_COUNT,
+                                                  "min_arrive_time": MIN_ARRIVE_TIME,
+                                                  "max_arrive_time": MAX_ARRIVE_TIME,
+                                                  "min_deadline": MIN_DEADLINE,
+                                                  "max_deadline": MAX_DEADLINE})
+
+    def loadProcessesFromBinary(self) -> None:
+        """Load requests from memory mapped binary records file."""
+        self.que = RequestRecords(BINARY_FILENAME, request_class=Request)
+
     def setupAlgorithms(self):
         self.table = AlgorithmsTable(self.main_widget)
         self.tableModel = AlgorithmsTableModel(self.table)
@@ -84,7 +93,7 @@ class MainWindow(FramelessWindow):
         self.main_widget.addWidget(self.table)
 
         for algorithm in self.algorithms:
-            algorithm_instance = algorithm(self.que, START_POS, DISK_SIZE)
+            algorithm_instance = algorithm(self.que, START_POS, DISK_SIZE, self.model)
             self.tableModel.addAlgorithm(algorithm_instance)
 
         self.start_button = QPushButton("Start", self)
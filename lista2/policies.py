@@ -0,0 +1,353 @@
+"""
+Disk scheduling algorithms as policies of engine.Engine, step does one decision of the algorithm.
+By default policy picks one queued request and head accesses it. pick gets queue of request indexes, ordered
+by cylinder (CylinderIndex) unless policy creates another one, and returns index of the chosen request
+and positions the head seeks through before going to its cylinder. Without timing model SCAN, C-SCAN, C-LOOK
+and FDF-SCAN sweep instead, head serves every request on a cylinder it passes and stops at every arrival.
+"""
+
+import heapq
+import collections
+
+from cylinder_index import CylinderIndex
+from deadline_queue import DeadlineQueue
+
+
+class Policy:
+    # reports show whether the longest waiting request was real time
+    real_time = False
+
+    def __init__(self, requests):
+        super(Policy, self).__init__()
+        self.requests = requests
+
+    def create_queue(self, disk_size):
+        """Returns queue of request indexes, engine adds and removes requests."""
+        return CylinderIndex(disk_size)
+
+    def start(self, engine) -> None:
+        """Called once before the first step."""
+
+    def queued(self, index) -> None:
+        """Called when request arrives."""
+
+    def served(self, index, finish_time) -> None:
+        """Called when head finished request."""
+
+    def pick(self, queue, position, time):
+        raise NotImplementedError
+
+    def step(self, engine) -> None:
+        engine.skip_idle()
+        engine.admit()
+        if len(engine.queue) != 0:
+            index, via = self.pick(engine.queue, engine.position, engine.time)
+            engine.access(index, via)
+
+
+class ArrivalQueue:
+    """Queued request indexes in arrival order, for policies which do not look at cylinders."""
+
+    def __init__(self):
+        super(ArrivalQueue, self).__init__()
+        self.queued = collections.deque()
+
+    def __len__(self):
+        return len(self.queued)
+
+    def __iter__(self):
+        return iter(self.queued)
+
+    def add(self, index, cylinder) -> None:
+        self.queued.append(index)
+
+    def remove(self, index) -> None:
+        if self.queued[0] == index:
+            self.queued.popleft()
+        else:
+            self.queued.remove(index)
+
+
+class FCFSPolicy(Policy):
+    def create_queue(self, disk_size):
+        return ArrivalQueue()
+
+    def pick(self, queue, position, time):
+        return queue.queued[0], ()
+
+
+class SSTFPolicy(Policy):
+    def pick(self, queue, position, time):
+        return queue.nearest(position), ()
+
+
+class ScanPolicy(Policy):
+    """Head goes to the edge of disk before turning back, first towards the first request by default."""
+
+    def __init__(self, requests, disk_size, to_right=None):
+        super(ScanPolicy, self).__init__(requests)
+        self.disk_size = disk_size
+        self.to_right = to_right
+        # head goes 0 .. disk size and back disk size .. 0 staying one tick on edges when turning,
+        # phase is position in this cycle so head position after any number of ticks is computed directly
+        self.cycle = 2 * (disk_size + 1)
+        self.phase = 0
+
+    def start(self, engine) -> None:
+        if self.to_right is None:
+            self.to_right = len(self.requests) == 0 or self.requests[0].cylinder >= engine.position
+        self.phase = engine.position if self.to_right else self.cycle - 1 - engine.position
+
+    def pick(self, queue, position, time):
+        via = ()
+        if self.to_right:
+            cylinder = queue.above(position - 1)
+            if cylinder is None:
+                self.to_right = False
+                cylinder = queue.below(self.disk_size + 1)
+                via = (self.disk_size,)
+        else:
+            cylinder = queue.below(position + 1)
+            if cylinder is None:
+                self.to_right = True
+                cylinder = queue.above(-1)
+                via = (0,)
+        return queue.buckets[cylinder][0], via
+
+    def step(self, engine) -> None:
+        if engine.timed:
+            return super(ScanPolicy, self).step(engine)
+        engine.admit()
+        engine.serve_cylinder()
+        if engine.finished:
+            return
+
+        # jump to next queued cylinder in sweep direction or to next arrival, whichever comes first
+        queue = engine.queue
+        position = engine.position
+        ticks = None
+        if len(queue) != 0:
+            if self.phase <= self.disk_size:
+                cylinder = queue.above(position)
+                if cylinder is not None:
+                    ticks = cylinder - position
+                else:
+                    ticks = self.cycle - 1 - queue.below(self.disk_size + 1) - self.phase
+            else:
+                cylinder = queue.below(position)
+                if cylinder is not None:
+                    ticks = position - cylinder
+                else:
+                    ticks = self.cycle + queue.above(-1) - self.phase
+        ticks = engine.until_arrival(ticks)
+        self.phase = (self.phase + ticks) % self.cycle
+        engine.advance(ticks, self.phase if self.phase <= self.disk_size else self.cycle - 1 - self.phase)
+
+
+class CScanPolicy(Policy):
+    """Head serves going up only, from the last cylinder it seeks back to 0."""
+
+    def __init__(self, requests, disk_size):
+        super(CScanPolicy, self).__init__(requests)
+        self.disk_size = disk_size
+
+    def pick(self, queue, position, time):
+        cylinder = queue.above(position - 1)
+        if cylinder is None:
+            return queue.buckets[queue.above(-1)][0], (self.disk_size, 0)
+        return queue.buckets[cylinder][0], ()
+
+    def step(self, engine) -> None:
+        if engine.timed:
+            return super(CScanPolicy, self).step(engine)
+        engine.admit()
+        engine.serve_cylinder()
+        if engine.finished:
+            return
+
+        # jump to next queued cylinder or to next arrival, whichever comes first,
+        # going back from the last cylinder to 0 takes one tick
+        queue = engine.queue
+        position = engine.position
+        ticks = None
+        if len(queue) != 0:
+            cylinder = queue.above(position)
+            if cylinder is not None:
+                ticks = cylinder - position
+            else:
+                ticks = self.disk_size + 1 - position + queue.above(-1)
+        ticks = engine.until_arrival(ticks)
+        engine.advance(ticks, (position + ticks) % (self.disk_size + 1))
+
+
+class CLookPolicy(Policy):
+    """Head serves going up only, after the highest requested cylinder it seeks to the lowest one."""
+
+    def pick(self, queue, position, time):
+        cylinder = queue.above(position - 1)
+        if cylinder is None:
+            cylinder = queue.above(-1)
+        return queue.buckets[cylinder][0], ()
+
+    def step(self, engine) -> None:
+        if engine.timed:
+            return super(CLookPolicy, self).step(engine)
+        engine.admit()
+        engine.serve_cylinder()
+        if engine.finished:
+            return
+
+        # queued requests wait only while head moves by one cylinder, not when it jumps
+        queue = engine.queue
+        position = engine.position
+        disk_size = engine.disk_size
+        if len(queue) == 0:
+            # nothing queued, head jumps between the last cylinder and 0 every tick until next arrival
+            ticks = engine.until_arrival(None)
+            jumps = ticks if position == disk_size else ticks - 1
+            engine.advance(ticks, 0 if jumps % 2 == 1 else disk_size, waited=0)
+            return
+
+        cylinder = queue.above(position)
+        if position == disk_size:
+            engine.advance(1, queue.above(-1), waited=0)
+        elif cylinder is None:
+            engine.advance(1, disk_size, waited=0)
+        else:
+            # move to next queued cylinder or to next arrival, whichever comes first
+            ticks = engine.until_arrival(cylinder - position)
+            engine.advance(ticks, position + ticks)
+
+
+class EDFPolicy(Policy):
+    """Real time request with the earliest deadline first, SSTF when there is none."""
+    real_time = True
+
+    def __init__(self, requests):
+        super(EDFPolicy, self).__init__(requests)
+        self.deadlines = DeadlineQueue(requests)
+
+    def queued(self, index) -> None:
+        if self.requests[index].real_time:
+            self.deadlines.add(index)
+
+    def served(self, index, finish_time) -> None:
+        if self.requests[index].real_time:
+            self.deadlines.record(index, finish_time)
+
+    def pick(self, queue, position, time):
+        if len(self.deadlines) > 0:
+            return self.deadlines.pop(), ()
+        return queue.nearest(position), ()
+
+
+class FDFScanPolicy(Policy):
+    """Real time request with the nearest deadline becomes target when head can reach it in time,
+    requests on the way to target are served too. SSTF when there is no target."""
+    real_time = True
+
+    def __init__(self, requests):
+        super(FDFScanPolicy, self).__init__(requests)
+        self.model = None
+        self.target = None
+        # queued real time requests as (deadline, index), entries of served requests are dropped from the top
+        self.nearest_deadlines = []
+
+    def start(self, engine) -> None:
+        self.model = engine.model
+
+    def queued(self, index) -> None:
+        if self.requests[index].real_time:
+            heapq.heappush(self.nearest_deadlines, (self.requests[index].deadline, index))
+
+    def served(self, index, finish_time) -> None:
+        if index == self.target:
+            self.target = None
+
+    def choose_target(self, queue, position) -> None:
+        # requests are queued in order of indexes, so ties go to the request queued first
+        nearest_deadlines = self.nearest_deadlines
+        while len(nearest_deadlines) > 0 and nearest_deadlines[0][1] not in queue:
+            heapq.heappop(nearest_deadlines)
+        if len(nearest_deadlines) > 0:
+            deadline, nearest_realtime = nearest_deadlines[0]
+            if deadline >= self.model.seek_time(abs(position - self.requests[nearest_realtime].cylinder)):
+                self.target = nearest_realtime
+
+    def pick(self, queue, position, time):
+        requests = self.requests
+        if self.target is None:
+            self.choose_target(queue, position)
+            if self.target is None:
+                return queue.nearest(position), ()
+
+        target_cylinder = requests[self.target].cylinder
+        if target_cylinder >= position:
+            cylinder = queue.above(position - 1)
+        else:
+            cylinder = queue.below(position + 1)
+        if cylinder == target_cylinder:
+            return self.target, ()
+        return queue.buckets[cylinder][0], ()
+
+    def step(self, engine) -> None:
+        if engine.timed:
+            return super(FDFScanPolicy, self).step(engine)
+        engine.skip_idle()
+        engine.admit()
+        queue = engine.queue
+        position = engine.position
+        if len(queue) == 0:
+            return
+
+        if self.target is None:
+            # target is chosen in one step and approached in the next ones
+            self.choose_target(queue, position)
+            if self.target is None:
+                engine.access(queue.nearest(position))
+        elif self.requests[self.target].cylinder == position:
+            engine.serve(self.target)
+        else:
+            engine.serve_cylinder()
+            # every cylinder on the way to target takes two ticks and one tick of waiting
+            target_cylinder = self.requests[self.target].cylinder
+            engine.advance(2, position + 1 if position < target_cylinder else position - 1, waited=1)
+
+
+class SPTFPolicy(Policy):
+    """Shortest positioning time first, request whose first sector the head reaches soonest.
+
+    Cylinders are checked from the closest one, positioning takes at least the seek,
+    so the search stops at the first cylinder whose seek is longer than the best positioning.
+    Ties go to the request queued first, like in SSTF."""
+
+    def __init__(self, requests):
+        super(SPTFPolicy, self).__init__(requests)
+        self.model = None
+
+    def start(self, engine) -> None:
+        self.model = engine.model
+
+    def pick(self, queue, position, time):
+        requests = self.requests
+        seek_table = self.model.seek_table
+        best = None
+        best_time = None
+        up = queue.above(position - 1)
+        down = queue.below(position)
+        while up is not None or down is not None:
+            if down is None or (up is not None and up - position <= position - down):
+                cylinder = up
+                up = queue.above(up)
+            else:
+                cylinder = down
+                down = queue.below(down)
+            if best is not None and seek_table[abs(position - cylinder)] > best_time:
+                break
+            for index in queue.buckets[cylinder]:
+                positioning = self.model.positioning_time(position, requests[index], time)
+                if best is None or positioning < best_time or (positioning == best_time and
+                                                               queue.queued[index][1] < queue.queued[best][1]):
+                    best = index
+                    best_time = positioning
+        return best, ()
@@ -0,0 +1,285 @@
+"""
+Disk array simulation, requests are striped across disks of RAID-0, RAID-1 or RAID-5 array.
+Every disk runs its own scheduler on its share of accesses, disks run in parallel processes.
+Request finishes when the last of its disk accesses finishes.
+
+python raid.py --level 5 --disks 8 --algorithm C-LOOK --requests 1000000
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import concurrent.futures
+
+import numpy as np
+
+from main import Main, DISK_SIZE, START_POS, MIN_ARRIVE_TIME, MAX_ARRIVE_TIME
+from request import RequestState
+from records import RequestRecords
+from batch import RequestBatch
+from metrics import Histogram
+from generators import generate_requests
+from utils import Logger
+
+# RAID level -> least number of disks
+MIN_DISKS = {0: 1, 1: 2, 5: 3}
+LEVELS = tuple(MIN_DISKS)
+ALGORITHMS = {
+    "FCFS": "run_fcfs",
+    "SSTF": "run_sstf",
+    "SCAN": "run_scan",
+    "C-SCAN": "run_c_scan",
+    "C-LOOK": "run_c_look",
+}
+# cylinders of one disk in one stripe unit
+STRIPE_UNIT = 16
+# share of generated requests which are writes
+WRITE_SHARE = 0.3
+# throughput is given in requests per this many ticks
+THROUGHPUT_TICKS = 1000
+
+
+def check_layout(level, disks, disk_size, stripe_unit=STRIPE_UNIT) -> None:
+    if level not in LEVELS:
+        raise ValueError("Unsupported RAID level {}, choose one of {}".format(level, LEVELS))
+    if disks < MIN_DISKS[level]:
+        raise ValueError("RAID-{} needs at least {} disks, got {}".format(level, MIN_DISKS[level], disks))
+    if not 1 <= stripe_unit <= disk_size + 1:
+        raise ValueError("Stripe unit of {} cylinders does not fit disk of size {}".format(stripe_unit, disk_size))
+
+
+def capacity(level, disks, disk_size, stripe_unit=STRIPE_UNIT) -> int:
+    """Returns number of logical cylinders of array, only full stripe rows are used."""
+    check_layout(level, disks, disk_size, stripe_unit)
+    rows = (disk_size + 1) // stripe_unit
+    data_units = {0: disks, 1: 1, 5: disks - 1}[level]
+    return rows * data_units * stripe_unit
+
+
+def map_requests(level, disks, disk_size, cylinders, writes, stripe_unit=STRIPE_UNIT):
+    """Returns owner (index of request), disk and cylinder of every disk access,
+    accesses of one request are next to each other in order of requests.
+
+    RAID-0 reads and writes one disk. RAID-1 reads from disks in turns and writes to all of them.
+    RAID-5 uses left symmetric parity, write accesses data disk and parity disk of the row,
+    reading old data and parity happens on the same cylinder so it is one access per disk."""
+    cylinders = np.asarray(cylinders, dtype=np.int64)
+    writes = np.asarray(writes, dtype=bool)
+    size = capacity(level, disks, disk_size, stripe_unit)
+    outside = (cylinders < 0) | (cylinders >= size)
+    if np.any(outside):
+        raise ValueError("Cylinder {} is outside of array of {} cylinders".format(
+            int(cylinders[np.argmax(outside)]), size))
+
+    unit, offset = np.divmod(cylinders, stripe_unit)
+    if level == 0:
+        counts = np.ones(len(cylinders), dtype=np.int64)
+        row, data_disk = np.divmod(unit, disks)
+    elif level == 1:
+        counts = np.where(writes, disks, 1)
+        row = unit
+    else:
+        counts = np.where(writes, 2, 1)
+        row, position = np.divmod(unit, disks - 1)
+        parity_disk = disks - 1 - row % disks
+        data_disk = (parity_disk + 1 + position) % disks
+
+    owner = np.repeat(np.arange(len(cylinders)), counts)
+    # position of access among accesses of its request
+    rank = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    if level == 0:
+        disk = data_disk[owner]
+    elif level == 1:
+        disk = (owner + rank) % disks
+    else:
+        disk = np.where(rank == 0, data_disk[owner], parity_disk[owner])
+    return owner, disk, (row * stripe_unit + offset)[owner]
+
+
+worker = None
+
+
+def init_worker(disk_size, start_pos):
+    global worker
+    logging.disable(logging.INFO)
+    worker = Main(disk_size, start_pos)
+
+
+def run_disk(algorithm, ids, arrive_times, cylinders) -> dict:
+    """Runs scheduler of one disk, returns its results and finish time of every access.
+    Accesses stay in arrays, engine decodes them when it reads them and static shares of FCFS, SCAN,
+    C-SCAN and C-LOOK are evaluated with numpy without engine."""
+    batch = RequestBatch(ids, arrive_times, cylinders)
+    if evaluate(batch, algorithm, worker.start_pos, worker.disk_size):
+        result = worker.report_batch(algorithm, batch)
+        result["finish_time"] = batch.completion_time
+        return result
+
+    worker.que = batch
+    state = RequestState(np.zeros(len(batch), dtype=np.int64))
+    outcome = getattr(worker, ALGORITHMS[algorithm])(state=state).join()
+    worker.que = []
+    if outcome["exit_code"] != 0:
+        raise RuntimeError(outcome["traceback"])
+    result = outcome["result"]
+    result["finish_time"] = state.finish_time
+    return result
+
+
+def evaluate(batch, algorithm, start_pos, disk_size) -> bool:
+    """Fills service of batch with vectorized evaluator, returns False when algorithm has none
+    or requests arrive after the head starts."""
+    if algorithm == "FCFS":
+        return batch.evaluate_fcfs(start_pos)
+    if algorithm == "SCAN":
+        return batch.evaluate_scan(start_pos, disk_size)
+    if algorithm == "C-SCAN":
+        return batch.evaluate_c_scan(start_pos, disk_size)
+    if algorithm == "C-LOOK":
+        return batch.evaluate_c_look(start_pos, disk_size)
+    return False
+
+
+def histogram(values) -> Histogram:
+    values, counts = np.unique(values, return_counts=True)
+    hist = Histogram()
+    for value, count in zip(values.tolist(), counts.tolist()):
+        hist.record(value, count=count)
+    return hist
+
+
+def throughput(count, start, end) -> float:
+    return round(count * THROUGHPUT_TICKS / max(end - start, 1), 2)
+
+
+def run_array(batch, level, disks, algorithm, writes=None, disk_size=DISK_SIZE, start_pos=START_POS,
+              stripe_unit=STRIPE_UNIT, workers=None) -> dict:
+    """Runs requests of batch, sorted by arrive time, on disk array. writes marks write requests,
+    all requests are reads when not given. Returns per disk and aggregate results."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unsupported algorithm {}, choose one of {}".format(algorithm, list(ALGORITHMS)))
+    if len(batch) == 0:
+        raise ValueError("No requests to run")
+    writes = np.zeros(len(batch), dtype=bool) if writes is None else writes
+    owner, disk, cylinder = map_requests(level, disks, disk_size, batch.cylinder, writes, stripe_unit)
+    arrive_time = batch.arrive_time[owner]
+    finish_time = np.zeros(len(owner), dtype=np.int64)
+
+    # accesses stay in order of requests, so every disk gets them sorted by arrive time
+    shares = [np.flatnonzero(disk == number) for number in range(disks)]
+    busy = [number for number in range(disks) if len(shares[number]) != 0]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(busy)),
+                                                initializer=init_worker,
+                                                initargs=(disk_size, start_pos)) as executor:
+        futures = {number: executor.submit(run_disk, algorithm, batch.id[owner[shares[number]]],
+                                           arrive_time[shares[number]], cylinder[shares[number]])
+                   for number in busy}
+        results = {number: future.result() for number, future in futures.items()}
+
+    per_disk = []
+    for number in range(disks):
+        share = shares[number]
+        report = {"disk": number, "accesses": len(share)}
+        if number in results:
+            result = results.pop(number)
+            finish_time[share] = result.pop("finish_time")
+            latency = histogram(finish_time[share] - arrive_time[share])
+            report.update({"average_waiting": result["average_waiting"],
+                           "waiting_percentiles": result["waiting_percentiles"],
+                           "throughput": throughput(len(share), int(arrive_time[share[0]]),
+                                                    int(finish_time[share].max())),
+                           "latency_percentiles": latency.percentiles()})
+        per_disk.append(report)
+
+    # request finishes with the last of its accesses
+    finished = np.maximum.reduceat(finish_time, np.flatnonzero(np.diff(owner, prepend=-1)))
+    latency = histogram(finished - batch.arrive_time)
+    return {"level": level,
+            "disks": disks,
+            "algorithm": algorithm,
+            "requests": len(batch),
+            "writes": int(np.count_nonzero(writes)),
+            "accesses": len(owner),
+            "throughput": throughput(len(batch), int(batch.arrive_time[0]), int(finished.max())),
+            "average_latency": round(latency.mean(), 2),
+            "longest_latency": latency.max,
+            "latency_percentiles": latency.percentiles(),
+            "per_disk": per_disk}
+
+
+def generate_batch(requests_count, disk_size, max_arrive_time=MAX_ARRIVE_TIME, seed=None) -> RequestBatch:
+    """Generates requests for logical disk of disk_size chunk by chunk, only arrays are kept."""
+    ids, arrive_times, cylinders = [], [], []
+    for chunk in generate_requests(requests_count, 0, disk_size, MIN_ARRIVE_TIME, max_arrive_time, 0, 0, seed=seed):
+        chunk = RequestBatch.from_requests(chunk)
+        ids.append(chunk.id)
+        arrive_times.append(chunk.arrive_time)
+        cylinders.append(chunk.cylinder)
+    return RequestBatch(np.concatenate(ids), np.concatenate(arrive_times), np.concatenate(cylinders))
+
+
+def format_report(report, wall_time=None) -> list:
+    lines = ["RAID-{} of {} disks, {}: {} requests ({} writes), {} disk accesses".format(
+        report["level"], report["disks"], report["algorithm"], report["requests"], report["writes"],
+        report["accesses"])]
+    lines.append("{:<6} {:>10} {:>12} {:>10} {:>10} {:>10}".format("Disk", "Accesses", "Throughput",
+                                                                  "Avg wait", "Lat p50", "Lat p99"))
+    for disk in report["per_disk"]:
+        if disk["accesses"] == 0:
+            lines.append("{:<6} {:>10}".format(disk["disk"], 0))
+            continue
+        lines.append("{:<6} {:>10} {:>12} {:>10} {:>10} {:>10}".format(
+            disk["disk"], disk["accesses"], disk["throughput"], disk["average_waiting"],
+            disk["latency_percentiles"]["p50"], disk["latency_percentiles"]["p99"]))
+    lines.append("Throughput: {} requests per {} ticks".format(report["throughput"], THROUGHPUT_TICKS))
+    lines.append("Average latency: {}, Longest latency: {}".format(report["average_latency"],
+                                                                 report["longest_latency"]))
+    lines.append("Latency percentiles: {}".format(", ".join("{} {}".format(name, value) for name, value
+                                                            in report["latency_percentiles"].items())))
+    if wall_time is not None:
+        lines.append("Finished in {:.3f} s".format(wall_time))
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulate disk array with a scheduler on every disk.")
+    parser.add_argument("--level", type=int, default=5, choices=LEVELS)
+    parser.add_argument("--disks", type=int, default=4)
+    parser.add_argument("--algorithm", default="C-LOOK", choices=list(ALGORITHMS))
+    parser.add_argument("--requests", type=int, default=100000, help="number of generated requests")
+    parser.add_argument("--max-arrive-time", type=int, default=MAX_ARRIVE_TIME)
+    parser.add_argument("--requests-file", default=None, help="binary records file (.bin) used instead")
+    parser.add_argument("--disk-size", type=int, default=DISK_SIZE)
+    parser.add_argument("--stripe-unit", type=int, default=STRIPE_UNIT)
+    parser.add_argument("--write-share", type=float, default=WRITE_SHARE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None, help="json file for results")
+    args = parser.parse_args()
+
+    log = Logger()
+    log.enable()
+    log.set_level(logging.INFO)
+    logger = logging.getLogger("RAID")
+
+    size = capacity(args.level, args.disks, args.disk_size, args.stripe_unit)
+    if args.requests_file is not None:
+        # batch columns are views of memory mapped records, disks get copies of their shares only
+        que = RequestBatch.from_records(RequestRecords(args.requests_file))
+    else:
+        que = generate_batch(args.requests, size - 1, args.max_arrive_time, args.seed)
+    write_requests = np.random.default_rng(args.seed).random(len(que)) < args.write_share
+
+    logger.info("Running {} requests on array of {} logical cylinders".format(len(que), size))
+    started = time.perf_counter()
+    array = run_array(que, args.level, args.disks, args.algorithm, write_requests, args.disk_size, START_POS,
+                      args.stripe_unit, args.workers)
+    for line in format_report(array, time.perf_counter() - started):
+        logger.info(line)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(array, file, indent=2)
+        logger.info("Results saved to {}".format(args.output))
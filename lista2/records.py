@@ -0,0 +1,153 @@
+"""
+Binary workload format.
+
+Header: magic, schema version, record size, record count, size of generator parameters.
+Header is followed by generator parameters encoded as json and fixed size request records.
+
+python records.py requests.pick requests.bin
+"""
+
+import sys
+import json
+import mmap
+import pickle
+import struct
+
+from request import Request
+
+MAGIC = b"LAB2DISK"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQI")
+# request id, arrive time, cylinder, deadline, real time
+RECORD = struct.Struct("<qqii?")
+# offsets of arrive time and cylinder in record
+ARRIVE_TIME = (8, struct.Struct("<q"))
+CYLINDER = (16, struct.Struct("<i"))
+WRITE_BATCH = 65536
+
+
+class RecordColumn:
+    """One field of every record read straight from memory mapped file, indexes give python integers."""
+
+    def __init__(self, records, field):
+        super(RecordColumn, self).__init__()
+        self.count = len(records)
+        self.buffer = records.buffer
+        start, unpacker = field
+        self.start = records.offset + start
+        self.unpack_from = unpacker.unpack_from
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.unpack_from(self.buffer, self.start + index * RECORD.size)[0]
+
+
+class RequestRecords:
+    """Read only sequence of requests decoded lazily from memory mapped file."""
+
+    def __init__(self, filename, request_class=Request):
+        super(RequestRecords, self).__init__()
+        self.filename = filename
+        self.request_class = request_class
+        with open(filename, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, self.count, params_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("{} is not a request records file".format(filename))
+        if version != VERSION or record_size != RECORD.size:
+            raise ValueError("Unsupported request records version {} in {}".format(version, filename))
+
+        self.params = json.loads(self.buffer[HEADER.size:HEADER.size + params_size].decode("utf-8"))
+        self.offset = HEADER.size + params_size
+
+    def decode(self, fields):
+        request_id, arrive_time, cylinder, deadline, real_time = fields
+        request = self.request_class(arrive_time, cylinder, real_time=real_time, deadline=deadline)
+        request.set_id(request_id)
+        return request
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def arrive_times(self):
+        """Arrive times read from the file, engine reads them without decoding requests."""
+        return RecordColumn(self, ARRIVE_TIME)
+
+    @property
+    def cylinders(self):
+        return RecordColumn(self, CYLINDER)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = index + self.count
+        if not 0 <= index < self.count:
+            raise IndexError("request record index out of range")
+        return self.decode(RECORD.unpack_from(self.buffer, self.offset + index * RECORD.size))
+
+    def __iter__(self):
+        view = memoryview(self.buffer)[self.offset:self.offset + self.count * RECORD.size]
+        try:
+            for fields in RECORD.iter_unpack(view):
+                yield self.decode(fields)
+        finally:
+            view.release()
+
+    def __deepcopy__(self, memo):
+        # records are decoded into new objects on every access, file itself is never modified
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (self.filename, self.request_class)
+
+    def close(self):
+        self.buffer.close()
+
+
+def write_records(filename, requests, params=None) -> int:
+    """Writes requests from any iterable, count is filled in after the last record."""
+    return write_record_chunks(filename, pack_records(requests), params)
+
+
+def pack_records(requests):
+    """Yields requests packed into batches of WRITE_BATCH records."""
+    batch = bytearray()
+    for count, req in enumerate(requests, 1):
+        batch += RECORD.pack(req.request_id, req.arrive_time, req.cylinder, req.deadline, req.real_time)
+        if count % WRITE_BATCH == 0:
+            yield batch
+            batch = bytearray()
+    yield batch
+
+
+def write_record_chunks(filename, chunks, params=None) -> int:
+    """Writes chunks of already packed records, any buffers like numpy arrays of batch.RECORD_DTYPE.
+    Count is filled in after the last chunk."""
+    params = json.dumps(params or {}).encode("utf-8")
+    count = 0
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, len(params)))
+        file.write(params)
+        for chunk in chunks:
+            size = memoryview(chunk).nbytes
+            if size % RECORD.size != 0:
+                raise ValueError("Chunk of {} bytes does not hold whole records".format(size))
+            file.write(chunk)
+            count = count + size // RECORD.size
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, len(params)))
+    return count
+
+
+def convert_pickle(pickle_filename, binary_filename, params=None) -> int:
+    """Converts pickled list of requests to binary records."""
+    with open(pickle_filename, "rb") as file:
+        requests = pickle.load(file)
+    return write_records(binary_filename, requests, params)
+
+
+if __name__ == '__main__':
+    print("Converted {} requests".format(convert_pickle(sys.argv[1], sys.argv[2])))
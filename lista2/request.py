@@ -1,5 +1,3 @@
-
-
 class Request:
 
     def __init__(self, arrive_time, cylinder, real_time=False, deadline=0):
@@ -20,3 +18,28 @@ class Request:
 
     def set_id(self, request_id: int):
         self.request_id = request_id
+
+
+class RequestState:
+    """Waiting state of requests during one run, requests are given by their indexes in workload.
+    Workload requests are shared between runs and never modified. Only queued requests are kept,
+    waiting times of served requests go to the histogram of the engine.
+    Finish times are kept only when finish_time, an array indexed like the workload, is given."""
+
+    def __init__(self, finish_time=None):
+        super(RequestState, self).__init__()
+        # wait clock at which queued requests were queued, clock of a run is total time every queued request waited
+        self.queue_time = {}
+        # time at which head reached cylinder of request
+        self.finish_time = finish_time
+
+    def set_queue_time(self, index, clock: int):
+        self.queue_time[index] = clock
+
+    def set_serve_time(self, index, clock: int) -> int:
+        """Request waited for wait clock advance since it was queued, returns its waiting time."""
+        return clock - self.queue_time.pop(index)
+
+    def set_finish_time(self, index, time: int):
+        if self.finish_time is not None:
+            self.finish_time[index] = time
@@ -0,0 +1,289 @@
+"""
+Replay of real block traces, blkparse text output and SNIA (MSR Cambridge) csv traces.
+Trace is read in blocks of whole lines, every block is split into fields and parsed with numpy at once,
+so trace of any size holds only one block in memory. Parsed records are written to binary records file,
+which schedulers read lazily like any other workload.
+
+python traces.py msr_hm_0.csv.gz requests.bin --format snia --capacity 41943040
+python compare.py --requests-file requests.bin
+"""
+
+import gzip
+import logging
+import argparse
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from main import DISK_SIZE
+from batch import RECORD_DTYPE
+from records import write_record_chunks
+from utils import Logger
+
+CHUNK_BYTES = 4 * 1024 * 1024
+HEADS = 16
+SECTORS_PER_TRACK = 63
+SECTOR_BYTES = 512
+# one tick is 4 us, revolution of default disk model then takes 8 ms like in 7200 rpm disk
+TICKS_PER_SECOND = 250000
+# blkparse action of replayed events, Q is request queued by block layer
+ACTION = "Q"
+# SNIA request types, requests of every type are replayed by default
+SNIA_TYPES = ("Read", "Write")
+# digits of the longest number, longer ones do not fit in 64 bit integer
+MAX_DIGITS = 18
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+COMMA = ord(",")
+ZERO = ord("0")
+# space and every control character
+SPACE = ord(" ")
+
+
+class Geometry:
+    """Cylinders, heads and sectors of disk with disk_size + 1 cylinders.
+    Logical block addresses go through sectors of a track, then through heads of a cylinder."""
+
+    def __init__(self, disk_size=DISK_SIZE, heads=HEADS, sectors_per_track=SECTORS_PER_TRACK):
+        super(Geometry, self).__init__()
+        if heads < 1 or sectors_per_track < 1:
+            raise ValueError("Disk needs at least one head and one sector per track")
+        self.disk_size = disk_size
+        self.heads = heads
+        self.sectors_per_track = sectors_per_track
+        self.sectors_per_cylinder = heads * sectors_per_track
+        self.capacity = (disk_size + 1) * self.sectors_per_cylinder
+
+    @classmethod
+    def for_capacity(cls, capacity, disk_size=DISK_SIZE, heads=HEADS):
+        """Returns geometry with the least sectors per track holding capacity sectors."""
+        per_cylinder = -(-capacity // (disk_size + 1))
+        return cls(disk_size, heads, max(1, -(-per_cylinder // heads)))
+
+    def cylinders(self, lbas):
+        outside = (lbas < 0) | (lbas >= self.capacity)
+        if np.any(outside):
+            raise ValueError("LBA {} is outside of disk of {} sectors, set bigger capacity".format(
+                int(lbas[np.argmax(outside)]), self.capacity))
+        return lbas // self.sectors_per_cylinder
+
+
+def line_fields(first, count, columns):
+    """Returns indexes of fields of every column in lines which have all columns."""
+    present = count > max(columns)
+    return [first[present] + column for column in columns]
+
+
+def csv_fields(data):
+    """Returns starts and ends of all fields of lines separated by commas,
+    and first field and field count of every line. Data ends with a newline."""
+    ends = np.flatnonzero((data == COMMA) | (data == NEWLINE))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    line_ends = np.flatnonzero(data[ends] == NEWLINE)
+    first = np.empty_like(line_ends)
+    first[:1] = 0
+    first[1:] = line_ends[:-1] + 1
+    # windows line ends
+    ends = ends - ((ends > starts) & (data[ends - 1] == CARRIAGE_RETURN))
+    return starts, ends, first, line_ends - first + 1
+
+
+def whitespace_fields(data, separator=None):
+    """Returns starts and ends of all fields of lines separated by whitespace or separator,
+    and first field and field count of every line. Data ends with a newline."""
+    space = data <= SPACE
+    if separator is not None:
+        space = space | (data == ord(separator))
+    # fields start where whitespace ends and end where it starts again
+    changes = np.empty(len(space), dtype=bool)
+    changes[0] = not space[0]
+    np.not_equal(space[1:], space[:-1], out=changes[1:])
+    edges = np.flatnonzero(changes)
+    starts = edges[0::2]
+    ends = edges[1::2]
+    # number of fields before every line end
+    line_ends = np.searchsorted(starts, np.flatnonzero(data == NEWLINE))
+    first = np.empty_like(line_ends)
+    first[:1] = 0
+    first[1:] = line_ends[:-1]
+    return starts, ends, first, line_ends - first
+
+
+def parse_integers(data, starts, ends):
+    """Parses decimal integers data[starts:ends] at once. Digits of every number are taken right aligned
+    from a sliding window view of data, so only one small matrix is built.
+    Returns values and mask of valid numbers."""
+    lengths = ends - starts
+    width = min(int(lengths.max(initial=1)), MAX_DIGITS)
+    padded = np.concatenate((np.zeros(width, dtype=np.uint8), data))
+    # window ending at end of every number, non digits wrap around above 9
+    digits = sliding_window_view(padded, width)[ends] - ZERO
+    # characters before the number are zeroed
+    digits *= np.arange(width, dtype=np.int16) >= (width - lengths).astype(np.int16)[:, None]
+    valid = (lengths > 0) & (lengths <= MAX_DIGITS) & (digits.max(axis=1, initial=0) <= 9)
+    values = np.zeros(len(starts), dtype=np.int64)
+    for column in range(width):
+        values *= 10
+        values += digits[:, column]
+    return values, valid
+
+
+def token_equals(data, starts, ends, token):
+    matches = (ends - starts) == len(token)
+    last = len(data) - 1
+    for position, char in enumerate(token.encode("ascii")):
+        matches = matches & (data[np.minimum(starts + position, last)] == char)
+    return matches
+
+
+def parse_blkparse(data, action=ACTION):
+    """Returns times in ns and starting sectors of action events of default blkparse output:
+    device, cpu, sequence, seconds.nanoseconds, pid, action, rwbs, sector + blocks [process].
+    Dot splits time into two fields. Other lines are skipped."""
+    starts, ends, first, count = whitespace_fields(data, separator=".")
+    seconds, fraction, event, sector, plus = line_fields(first, count, (3, 4, 6, 8, 9))
+    # blkparse prints several events of every request, numbers are parsed only in lines of replayed one
+    matches = (token_equals(data, starts[event], ends[event], action)
+               & token_equals(data, starts[plus], ends[plus], "+"))
+    seconds, fraction, sector = seconds[matches], fraction[matches], sector[matches]
+    whole, valid_seconds = parse_integers(data, starts[seconds], ends[seconds])
+    nanoseconds, valid_fraction = parse_integers(data, starts[fraction], ends[fraction])
+    fraction_digits = ends[fraction] - starts[fraction]
+    sectors, valid_sectors = parse_integers(data, starts[sector], ends[sector])
+    keep = valid_seconds & valid_fraction & (fraction_digits <= 9) & valid_sectors
+    nanoseconds = nanoseconds * 10 ** np.clip(9 - fraction_digits, 0, 9)
+    return (whole * 10 ** 9 + nanoseconds)[keep], sectors[keep]
+
+
+def parse_snia(data, action=None):
+    """Returns times in 100 ns units and starting sectors of MSR Cambridge csv trace lines:
+    timestamp, hostname, disk number, type, offset, size, response time. Action is Read or Write type
+    of replayed requests, None replays both. Header and broken lines are skipped."""
+    starts, ends, first, count = csv_fields(data)
+    time, request_type, offset = line_fields(first, count, (0, 3, 4))
+    if action is not None:
+        matches = token_equals(data, starts[request_type], ends[request_type], action)
+        time, offset = time[matches], offset[matches]
+    times, valid_times = parse_integers(data, starts[time], ends[time])
+    offsets, valid_offsets = parse_integers(data, starts[offset], ends[offset])
+    keep = valid_times & valid_offsets
+    return times[keep], offsets[keep] // SECTOR_BYTES
+
+
+# format -> parser, its time units per second and default action
+FORMATS = {
+    "blkparse": (parse_blkparse, 10 ** 9, ACTION),
+    "snia": (parse_snia, 10 ** 7, None),
+}
+
+
+def read_lines(file, chunk_bytes=CHUNK_BYTES):
+    """Yields blocks of whole lines as uint8 arrays ending with a newline."""
+    rest = b""
+    while True:
+        block = file.read(chunk_bytes)
+        if len(block) == 0:
+            if len(rest) != 0:
+                yield np.frombuffer(rest + b"\n", dtype=np.uint8)
+            return
+        data = rest + block if len(rest) != 0 else block
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            # line longer than block
+            rest = data
+            continue
+        rest = data[end:]
+        yield np.frombuffer(data, dtype=np.uint8, count=end)
+
+
+def read_trace(filename, trace_format, geometry, ticks_per_second=TICKS_PER_SECOND, action=None,
+               chunk_bytes=CHUNK_BYTES):
+    """Yields chunks of records of batch.RECORD_DTYPE, one for every block of trace.
+    Ids follow trace order starting from 1, arrive times are ticks since the first record.
+    Records which come earlier than the record before them arrive together with it, so queue keeps trace order.
+    Action selects replayed events, blkparse action or SNIA request type, format default when not given."""
+    parse, units, action = trace_parser(trace_format, action)
+    opener = gzip.open if filename.endswith(".gz") else open
+    first_time = None
+    last_arrival = 0
+    next_id = 1
+    with opener(filename, "rb") as file:
+        for data in read_lines(file, chunk_bytes):
+            times, lbas = parse(data, action)
+            if len(times) == 0:
+                continue
+            if first_time is None:
+                first_time = int(times[0])
+            elapsed = np.maximum(times - first_time, 0)
+            # whole seconds and the rest separately, product of times in ns and ticks would overflow
+            arrive_times = (elapsed // units) * ticks_per_second + (elapsed % units) * ticks_per_second // units
+            arrive_times = np.maximum.accumulate(np.maximum(arrive_times, last_arrival))
+            last_arrival = int(arrive_times[-1])
+
+            chunk = np.zeros(len(times), dtype=RECORD_DTYPE)
+            chunk["id"] = np.arange(next_id, next_id + len(times))
+            chunk["arrive_time"] = arrive_times
+            chunk["cylinder"] = geometry.cylinders(lbas)
+            next_id = next_id + len(times)
+            yield chunk
+
+
+def trace_parser(trace_format, action=None):
+    """Returns parser of format, its time units per second and replayed action, default one when not given."""
+    if trace_format not in FORMATS:
+        raise ValueError("Unsupported trace format {}, choose one of {}".format(trace_format, list(FORMATS)))
+    parse, units, default_action = FORMATS[trace_format]
+    action = default_action if action is None else action
+    if trace_format == "snia" and action is not None and action not in SNIA_TYPES:
+        raise ValueError("Unsupported SNIA request type {}, choose one of {}".format(action, SNIA_TYPES))
+    return parse, units, action
+
+
+def convert_trace(trace_filename, binary_filename, trace_format, geometry, ticks_per_second=TICKS_PER_SECOND,
+                  action=None) -> int:
+    """Converts trace to binary records file, returns number of records.
+    Parameters record replayed action, None when every SNIA request is replayed."""
+    _, _, action = trace_parser(trace_format, action)
+    return write_record_chunks(binary_filename,
+                               read_trace(trace_filename, trace_format, geometry, ticks_per_second, action),
+                               {"trace": trace_filename,
+                                "format": trace_format,
+                                "disk_size": geometry.disk_size,
+                                "heads": geometry.heads,
+                                "sectors_per_track": geometry.sectors_per_track,
+                                "ticks_per_second": ticks_per_second,
+                                "action": action})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert block trace to binary records for replay.")
+    parser.add_argument("trace", help="blkparse output or SNIA csv trace, may be gzipped")
+    parser.add_argument("output", help="binary records file (.bin)")
+    parser.add_argument("--format", default="blkparse", choices=list(FORMATS))
+    parser.add_argument("--disk-size", type=int, default=DISK_SIZE)
+    parser.add_argument("--heads", type=int, default=HEADS)
+    parser.add_argument("--sectors-per-track", type=int, default=SECTORS_PER_TRACK)
+    parser.add_argument("--capacity", type=int, default=None,
+                        help="disk capacity in sectors, sectors per track are chosen to hold it")
+    parser.add_argument("--ticks-per-second", type=int, default=TICKS_PER_SECOND)
+    parser.add_argument("--action", default=None,
+                        help="replayed blkparse action, Q by default, or SNIA request type, Read or Write, "
+                             "all requests by default")
+    args = parser.parse_args()
+
+    log = Logger()
+    log.enable()
+    log.set_level(logging.INFO)
+    logger = logging.getLogger("TRACE")
+
+    if args.capacity is not None:
+        disk = Geometry.for_capacity(args.capacity, args.disk_size, args.heads)
+    else:
+        disk = Geometry(args.disk_size, args.heads, args.sectors_per_track)
+    logger.info("Geometry: {} cylinders, {} heads, {} sectors per track".format(
+        disk.disk_size + 1, disk.heads, disk.sectors_per_track))
+    logger.info("Converted {} records".format(convert_trace(args.trace, args.output, args.format, disk,
+                                                             args.ticks_per_second, args.action)))
@@ -1,5 +1,6 @@
 import logging
 import threading
+import traceback
 import functools
 import coloredlogs
 
@@ -42,6 +43,7 @@ class TaskThread(threading.Thread):
         super(TaskThread, self).__init__(group, target, name, args, kwargs, daemon=daemon)
         self.result = None
         self.exit_code = None
+        self.traceback = None
 
     def run(self):
         if self._target is not None:
@@ -51,10 +53,11 @@ class TaskThread(threading.Thread):
             except Exception as e:
                 self.result = e
                 self.exit_code = 1
+                self.traceback = traceback.format_exc()
 
     def join(self, timeout=None):
         threading.Thread.join(self, timeout)
-        return {"result": self.result, "exit_code": self.exit_code}
+        return {"result": self.result, "exit_code": self.exit_code, "traceback": self.traceback}
 
 
 def threaded(function):
@@ -0,0 +1,47 @@
+"""
+Seeded workload generators.
+Requests are produced in arrival order, in chunks, without building the whole workload.
+Same seed always gives the same requests.
+"""
+
+import random
+
+from request import Request
+
+CHUNK_SIZE = 65536
+
+
+def generate_requests(requests_count, virtual_memory, local_min_length, local_max_length, local_max_delta,
+                      local_chance, seed=None, chunk_size=CHUNK_SIZE, rng=None):
+    """Yields lists of page access requests with arrive times from 1 to requests_count.
+    Pass rng to continue drawing from an existing random generator instead of seeding a new one."""
+    rng = rng or random.Random(seed)
+    chunk = []
+    arrive_time = 1
+    while arrive_time != requests_count + 1:
+        if rng.randint(0, 10) < local_chance:
+            # generate sequence of local request
+            local_length = rng.randint(local_min_length, local_max_length)
+            local_mid_page = rng.randint(1, virtual_memory + 1)
+            for i in range(local_length):
+                if arrive_time >= requests_count + 1:
+                    break
+                while True:
+                    # generate random page and check if it exists in memory
+                    local_page = local_mid_page + rng.randint(-local_max_delta, local_max_delta)
+                    if 1 <= local_page <= virtual_memory:
+                        break
+                chunk.append(Request(local_page, arrive_time, local=True))
+                arrive_time = arrive_time + 1
+
+        else:
+            # generate one random request
+            chunk.append(Request(rng.randint(1, virtual_memory + 1), arrive_time))
+            arrive_time = arrive_time + 1
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
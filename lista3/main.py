@@ -8,15 +8,17 @@ jak często występuje lokalność odwołań
 from qtpy.QtCore import QObject, qInstallMessageHandler
 
 import sys
-import copy
 import pickle
 import random
 import logging
 import operator
+import itertools
 import traceback
 import collections
 
 from request import Request
+from records import RequestRecords, write_records
+from generators import generate_requests
 from utils import Logger, qt_message_handler
 
 REQUESTS_COUNT = 2000
@@ -29,6 +31,7 @@ LOCAL_REQUESTS_CHANCE = 10  # range 1-10 | *10% chance of generating local reque
 
 LOGGING_LEVEL = logging.INFO
 PICKLED_FILENAME = "requests.pick"
+BINARY_FILENAME = "requests.bin"
 
 
 class Main(QObject):
@@ -37,30 +40,12 @@ class Main(QObject):
         super(Main, self).__init__()
         self.que = []
 
-    def create_requests(self) -> None:
+    def create_requests(self, seed=None, requests_count=REQUESTS_COUNT) -> None:
         """Fills queue with disk access requests."""
-        arrive_time = 1
-        while arrive_time != REQUESTS_COUNT + 1:
-            if random.randint(0, 10) < LOCAL_REQUESTS_CHANCE:
-                # generate sequence of local request
-                local_length = random.randint(LOCAL_REQUESTS_MIN_LENGTH, LOCAL_REQUESTS_MAX_LENGTH)
-                local_mid_page = random.randint(1, VIRTUAL_MEMORY + 1)
-                for i in range(local_length):
-                    if arrive_time >= REQUESTS_COUNT + 1:
-                        break
-                    while True:
-                        # generate random page and check if it exists in memory
-                        local_page = local_mid_page + random.randint(-LOCAL_REQUESTS_MAX_DELTA,
-                                                                     LOCAL_REQUESTS_MAX_DELTA)
-                        if local_page in range(1, VIRTUAL_MEMORY + 1):
-                            break
-                    self.que.append(Request(local_page, arrive_time, local=True))
-                    arrive_time = arrive_time + 1
-
-            else:
-                # generate one random request
-                self.que.append(Request(random.randint(1, VIRTUAL_MEMORY + 1), arrive_time))
-                arrive_time = arrive_time + 1
+        for chunk in generate_requests(requests_count, VIRTUAL_MEMORY, LOCAL_REQUESTS_MIN_LENGTH,
+                                       LOCAL_REQUESTS_MAX_LENGTH, LOCAL_REQUESTS_MAX_DELTA, LOCAL_REQUESTS_CHANCE,
+                                       seed=seed):
+            self.que.extend(chunk)
 
     def save_requests_to_file(self) -> None:
         """Saves requests to file using pickle."""
@@ -72,6 +57,35 @@ class Main(QObject):
         with open(PICKLED_FILENAME, "rb") as file:
             self.que = pickle.load(file)
 
+    def save_requests_to_binary(self) -> None:
+        """Saves requests to binary records file."""
+        write_records(BINARY_FILENAME, self.que, {"requests_count": REQUESTS_COUNT,
+                                                  "virtual_memory": VIRTUAL_MEMORY,
+                                                  "local_requests_min_length": LOCAL_REQUESTS_MIN_LENGTH,
+                                                  "local_requests_max_length": LOCAL_REQUESTS_MAX_LENGTH,
+                                                  "local_requests_max_delta": LOCAL_REQUESTS_MAX_DELTA,
+                                                  "local_requests_chance": LOCAL_REQUESTS_CHANCE})
+
+    def load_requests_from_binary(self) -> None:
+        """Load requests from memory mapped binary records file."""
+        self.que = RequestRecords(BINARY_FILENAME)
+
+    def stream_requests_to_binary(self, requests_count, seed=None) -> None:
+        """Generates requests straight to binary file, only one chunk is kept in memory."""
+        write_records(BINARY_FILENAME,
+                      itertools.chain.from_iterable(generate_requests(requests_count, VIRTUAL_MEMORY,
+                                                                      LOCAL_REQUESTS_MIN_LENGTH,
+                                                                      LOCAL_REQUESTS_MAX_LENGTH,
+                                                                      LOCAL_REQUESTS_MAX_DELTA,
+                                                                      LOCAL_REQUESTS_CHANCE, seed=seed)),
+                      {"requests_count": requests_count,
+                       "virtual_memory": VIRTUAL_MEMORY,
+                       "local_requests_min_length": LOCAL_REQUESTS_MIN_LENGTH,
+                       "local_requests_max_length": LOCAL_REQUESTS_MAX_LENGTH,
+                       "local_requests_max_delta": LOCAL_REQUESTS_MAX_DELTA,
+                       "local_requests_chance": LOCAL_REQUESTS_CHANCE,
+                       "seed": seed})
+
     def print_requests(self):
         logging.getLogger("GENERATOR").info([str(req) for req in self.que])
 
@@ -79,8 +93,7 @@ class Main(QObject):
         logger = logging.getLogger("FIFO")
         frames = [None] * PHYSICAL_MEMORY
         page_faults = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = collections.deque(self.que)
 
         while True:
             request: Request = incomming.popleft()
@@ -92,7 +105,6 @@ class Main(QObject):
                 longest_staying: Request = min(frames, key=operator.attrgetter("arrive_time"))
                 frames[frames.index(longest_staying)] = request
 
-            completed.append(request)
             if len(incomming) == 0:
                 break
         logger.info("================= FIFO =================")
@@ -103,8 +115,7 @@ class Main(QObject):
         logger = logging.getLogger("OPT")
         frames = [None] * PHYSICAL_MEMORY
         page_faults = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = collections.deque(self.que)
 
         while True:
             request: Request = incomming.popleft()
@@ -126,7 +137,6 @@ class Main(QObject):
                     if frame is not None and frame.get_page() == max_page:
                         frames[index] = request
 
-            completed.append(request)
             if len(incomming) == 0:
                 break
 
@@ -137,25 +147,28 @@ class Main(QObject):
     def run_LRU(self):
         logger = logging.getLogger("LRU")
         frames = [None] * PHYSICAL_MEMORY
+        # last use time of request in every frame, requests are shared between runs and never modified
+        last_used = [0] * PHYSICAL_MEMORY
         page_faults = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = collections.deque(self.que)
 
         while True:
             request: Request = incomming.popleft()
             if request.get_page() not in [req.get_page() for req in frames if req is not None]:
                 page_faults += 1
                 if any(req is None for req in frames):
-                    frames[frames.index(None)] = request
+                    index = frames.index(None)
+                    frames[index] = request
+                    last_used[index] = request.get_last_used_time()
                     continue
-                lru = min(frames, key=lambda f: f.get_last_used_time())
-                frames[frames.index(lru)] = request
+                lru = min(range(len(frames)), key=last_used.__getitem__)
+                frames[lru] = request
+                last_used[lru] = request.get_last_used_time()
             else:
-                for frame in frames:
+                for index, frame in enumerate(frames):
                     if frame and frame.get_page() == request.get_page():
-                        frame.set_last_used_time(request.get_last_used_time())
+                        last_used[index] = request.get_last_used_time()
 
-            completed.append(request)
             if len(incomming) == 0:
                 break
 
@@ -166,9 +179,11 @@ class Main(QObject):
     def run_SC(self):
         logger = logging.getLogger("SC")
         frames = [None] * PHYSICAL_MEMORY
+        # recall byte of request in every frame, requests are shared between runs and never modified
+        recall_bytes = [0] * PHYSICAL_MEMORY
         page_faults = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = collections.deque(self.que)
+        # frame indexes in order of loading
         fifo = collections.deque(maxlen=PHYSICAL_MEMORY)
 
         while True:
@@ -176,18 +191,20 @@ class Main(QObject):
             if request.get_page() not in [req.get_page() for req in frames if req is not None]:
                 page_faults += 1
                 if any(req is None for req in frames):
-                    frames[frames.index(None)] = request
-                    fifo.append(request)
+                    index = frames.index(None)
+                    frames[index] = request
+                    recall_bytes[index] = request.get_recall_byte()
+                    fifo.append(index)
                     continue
-                while fifo[0].get_recall_byte() != 0:
-                    req = fifo.popleft()
-                    req.set_recall_byte(0)
-                    fifo.append(req)
-                req = fifo.popleft()
-                fifo.append(request)
-                frames[frames.index(req)] = request
-
-            completed.append(request)
+                while recall_bytes[fifo[0]] != 0:
+                    index = fifo.popleft()
+                    recall_bytes[index] = 0
+                    fifo.append(index)
+                index = fifo.popleft()
+                fifo.append(index)
+                frames[index] = request
+                recall_bytes[index] = request.get_recall_byte()
+
             if len(incomming) == 0:
                 break
 
@@ -199,8 +216,7 @@ class Main(QObject):
         logger = logging.getLogger("RAND")
         frames = [None] * PHYSICAL_MEMORY
         page_faults = 0
-        incomming = collections.deque(copy.deepcopy(self.que))
-        completed = collections.deque()
+        incomming = collections.deque(self.que)
 
         while True:
             request: Request = incomming.popleft()
@@ -210,7 +226,6 @@ class Main(QObject):
                     frames[frames.index(None)] = request
                     continue
                 frames[random.randint(0, len(frames) - 1)] = request
-            completed.append(request)
             if len(incomming) == 0:
                 break
         logger.info("================= RAND =================")
@@ -0,0 +1,106 @@
+"""
+Binary workload format.
+
+Header: magic, schema version, record size, record count, size of generator parameters.
+Header is followed by generator parameters encoded as json and fixed size request records.
+
+python records.py requests.pick requests.bin
+"""
+
+import sys
+import json
+import mmap
+import pickle
+import struct
+
+from request import Request
+
+MAGIC = b"LAB3PAGE"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQI")
+# arrive time, page, local
+RECORD = struct.Struct("<qi?")
+WRITE_BATCH = 65536
+
+
+class RequestRecords:
+    """Read only sequence of requests decoded lazily from memory mapped file."""
+
+    def __init__(self, filename):
+        super(RequestRecords, self).__init__()
+        self.filename = filename
+        with open(filename, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, self.count, params_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("{} is not a request records file".format(filename))
+        if version != VERSION or record_size != RECORD.size:
+            raise ValueError("Unsupported request records version {} in {}".format(version, filename))
+
+        self.params = json.loads(self.buffer[HEADER.size:HEADER.size + params_size].decode("utf-8"))
+        self.offset = HEADER.size + params_size
+
+    @staticmethod
+    def decode(fields):
+        arrive_time, page, local = fields
+        return Request(page, arrive_time, local=local)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = index + self.count
+        if not 0 <= index < self.count:
+            raise IndexError("request record index out of range")
+        return self.decode(RECORD.unpack_from(self.buffer, self.offset + index * RECORD.size))
+
+    def __iter__(self):
+        view = memoryview(self.buffer)[self.offset:self.offset + self.count * RECORD.size]
+        try:
+            for fields in RECORD.iter_unpack(view):
+                yield self.decode(fields)
+        finally:
+            view.release()
+
+    def __deepcopy__(self, memo):
+        # records are decoded into new objects on every access, file itself is never modified
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (self.filename,)
+
+    def close(self):
+        self.buffer.close()
+
+
+def write_records(filename, requests, params=None) -> int:
+    """Writes requests from any iterable, count is filled in after the last record."""
+    params = json.dumps(params or {}).encode("utf-8")
+    count = 0
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, len(params)))
+        file.write(params)
+        batch = bytearray()
+        for req in requests:
+            batch += RECORD.pack(req.get_arrive_time(), req.get_page(), req.is_local())
+            count = count + 1
+            if count % WRITE_BATCH == 0:
+                file.write(batch)
+                batch.clear()
+        file.write(batch)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, len(params)))
+    return count
+
+
+def convert_pickle(pickle_filename, binary_filename, params=None) -> int:
+    """Converts pickled list of requests to binary records."""
+    with open(pickle_filename, "rb") as file:
+        requests = pickle.load(file)
+    return write_records(binary_filename, requests, params)
+
+
+if __name__ == '__main__':
+    print("Converted {} requests".format(convert_pickle(sys.argv[1], sys.argv[2])))
@@ -1,14 +1,17 @@
-import copy
 import pickle
 import random
 import logging
+import itertools
 
 from utils import Logger
 from process import Process
 from request import Request
+from records import ProcessRecords, write_records, write_stream
+from generators import generate_requests, generate_processes
 
 LOGGING_LEVEL = logging.DEBUG
 PICKLED_FILENAME = "processes.dump"
+BINARY_FILENAME = "processes.bin"
 
 PROCESS_COUNT = 10
 
@@ -44,38 +47,18 @@ class Main:
         self.logger.info("Frames count is {}".format(FRAMES_COUNT))
         self.logger.info("Thrashing factor is {}".format(THRASHING_FACTOR))
 
-    def create_requests(self, process_size) -> list:
+    def create_requests(self, process_size, rng=random) -> list:
         """Fills queue with page access requests."""
-        que = []
-        arrive_time = 1
-        while arrive_time != REQUESTS_COUNT + 1:
-            if random.randint(0, 10) < LOCAL_REQUESTS_CHANCE:
-                # generate sequence of local request
-                local_length = random.randint(LOCAL_REQUESTS_MIN_LENGTH, LOCAL_REQUESTS_MAX_LENGTH)
-                local_mid_page = random.randint(1, process_size + 1)
-                for i in range(local_length):
-                    if arrive_time >= REQUESTS_COUNT + 1:
-                        break
-                    while True:
-                        # generate random page and check if it exists in memory
-                        local_page = local_mid_page + random.randint(-LOCAL_REQUESTS_MAX_DELTA,
-                                                                     LOCAL_REQUESTS_MAX_DELTA)
-                        if local_page in range(1, process_size + 1):
-                            break
-                    que.append(Request(local_page, arrive_time, local=True))
-                    arrive_time = arrive_time + 1
+        return list(itertools.chain.from_iterable(
+            generate_requests(REQUESTS_COUNT, process_size, LOCAL_REQUESTS_MIN_LENGTH, LOCAL_REQUESTS_MAX_LENGTH,
+                              LOCAL_REQUESTS_MAX_DELTA, LOCAL_REQUESTS_CHANCE, rng=rng)))
 
-            else:
-                # generate one random request
-                que.append(Request(random.randint(1, process_size + 1), arrive_time))
-                arrive_time = arrive_time + 1
-        return que
-
-    def create_processes(self):
+    def create_processes(self, seed=None, requests_count=REQUESTS_COUNT):
         """Create x processes with random size."""
-        for _ in range(PROCESS_COUNT):
-            proc_size = random.randint(MIN_PAGE_COUNT, MAX_PAGE_COUNT)
-            self.processes.append(Process(self.create_requests(proc_size), proc_size,
+        for proc_size, requests in generate_processes(PROCESS_COUNT, MIN_PAGE_COUNT, MAX_PAGE_COUNT, requests_count,
+                                                      LOCAL_REQUESTS_MIN_LENGTH, LOCAL_REQUESTS_MAX_LENGTH,
+                                                      LOCAL_REQUESTS_MAX_DELTA, LOCAL_REQUESTS_CHANCE, seed=seed):
+            self.processes.append(Process(list(itertools.chain.from_iterable(requests)), proc_size,
                                           THRASHING_MIN_LENGTH, THRASHING_FACTOR))
 
     def save_processes_to_file(self) -> None:
@@ -88,9 +71,44 @@ class Main:
         with open(PICKLED_FILENAME, "rb") as file:
             self.processes = pickle.load(file)
 
+    def save_processes_to_binary(self) -> None:
+        """Saves processes to binary records file."""
+        write_records(BINARY_FILENAME, self.processes, {"process_count": PROCESS_COUNT,
+                                                        "min_page_count": MIN_PAGE_COUNT,
+                                                        "max_page_count": MAX_PAGE_COUNT,
+                                                        "requests_count": REQUESTS_COUNT,
+                                                        "local_requests_min_length": LOCAL_REQUESTS_MIN_LENGTH,
+                                                        "local_requests_max_length": LOCAL_REQUESTS_MAX_LENGTH,
+                                                        "local_requests_max_delta": LOCAL_REQUESTS_MAX_DELTA,
+                                                        "local_requests_chance": LOCAL_REQUESTS_CHANCE})
+
+    def load_processes_from_binary(self) -> None:
+        """Load processes from memory mapped binary records file."""
+        # processes consume their requests while running, so every process gets its own queue
+        self.processes = list(ProcessRecords(BINARY_FILENAME))
+
+    def stream_processes_to_binary(self, process_count, requests_count, seed=None) -> None:
+        """Generates processes straight to binary file, only one chunk of requests is kept in memory."""
+        write_stream(BINARY_FILENAME, process_count,
+                     ((proc_size, THRASHING_MIN_LENGTH, THRASHING_FACTOR, itertools.chain.from_iterable(requests))
+                      for proc_size, requests in generate_processes(process_count, MIN_PAGE_COUNT, MAX_PAGE_COUNT,
+                                                                    requests_count, LOCAL_REQUESTS_MIN_LENGTH,
+                                                                    LOCAL_REQUESTS_MAX_LENGTH,
+                                                                    LOCAL_REQUESTS_MAX_DELTA,
+                                                                    LOCAL_REQUESTS_CHANCE, seed=seed)),
+                     {"process_count": process_count,
+                      "min_page_count": MIN_PAGE_COUNT,
+                      "max_page_count": MAX_PAGE_COUNT,
+                      "requests_count": requests_count,
+                      "local_requests_min_length": LOCAL_REQUESTS_MIN_LENGTH,
+                      "local_requests_max_length": LOCAL_REQUESTS_MAX_LENGTH,
+                      "local_requests_max_delta": LOCAL_REQUESTS_MAX_DELTA,
+                      "local_requests_chance": LOCAL_REQUESTS_CHANCE,
+                      "seed": seed})
+
     def run_equal_allocation(self):
         logger = logging.getLogger("EQUAL_ALLOCATION")
-        processes = copy.deepcopy(self.processes)
+        processes = [proc.new_run() for proc in self.processes]
 
         for proc in processes:
             proc.set_frames_count(int(FRAMES_COUNT / proc.get_page_count()))
@@ -106,7 +124,7 @@ class Main:
 
     def run_proportional_allocation(self):
         logger = logging.getLogger("PROPORTIONAL_ALLOCATION")
-        processes = copy.deepcopy(self.processes)
+        processes = [proc.new_run() for proc in self.processes]
         pages_sum = sum(proc.get_page_count() for proc in processes)
 
         for proc in processes:
@@ -123,7 +141,7 @@ class Main:
 
     def run_dynamic_fault_frequency(self):
         logger = logging.getLogger("FAULT_FREQUENCY_CONTROL")
-        processes = copy.deepcopy(self.processes)
+        processes = [proc.new_run() for proc in self.processes]
         finished = []
         pages_sum = sum(proc.get_page_count() for proc in processes)
         free_frames = FRAMES_COUNT
@@ -181,7 +199,7 @@ class Main:
 
     def run_dynamic_zone(self):
         logger = logging.getLogger("ZONE_MODEL")
-        processes = copy.deepcopy(self.processes)
+        processes = [proc.new_run() for proc in self.processes]
         finished = []
         pages_sum = sum(proc.get_page_count() for proc in processes)
         free_frames = FRAMES_COUNT
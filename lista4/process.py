@@ -5,6 +5,9 @@ from request import Request
 
 
 class Process:
+    # processes pickled before requests were kept read them from incomming
+    requests = None
+
     def __init__(self, que: list, page_count: int, thrashing_min_length, thrashing_factor):
         super(Process, self).__init__()
         self.time = 0
@@ -22,9 +25,16 @@ class Process:
         self.ppf = []
         self.wss = []
 
+        # requests are shared between runs, state of a run is kept in process
+        self.requests = que
         self.incomming = collections.deque(que)
-        self.completed = collections.deque()
         self.frames: typing.List[Request] = []
+        self.last_used: typing.List[int] = []
+
+    def new_run(self):
+        """Returns process which has not run yet, sharing requests with this one."""
+        requests = self.requests if self.requests is not None else list(self.incomming)
+        return Process(requests, self.page_count, self.thrashing_min_length, self.thrashing_factor)
 
     def is_running(self):
         return self.running
@@ -40,12 +50,15 @@ class Process:
 
     def set_frames_count(self, count):
         self.frames = [None] * count  # noqa
+        self.last_used = [0] * count
 
     def remove_frame(self):
         del self.frames[-1]
+        del self.last_used[-1]
 
     def add_frame(self):
         self.frames.append(None)
+        self.last_used.append(0)
 
     def frames_count(self):
         return len(self.frames)
@@ -80,14 +93,15 @@ class Process:
             self.wss.append(request)
             self.ppf.append(request)
             if any(req is None for req in self.frames):
-                self.frames[self.frames.index(None)] = request
+                index = self.frames.index(None)
             else:
-                lru = min(self.frames, key=lambda f: f.get_last_used_time())
-                self.frames[self.frames.index(lru)] = request
+                index = min(range(len(self.frames)), key=self.last_used.__getitem__)
+            self.frames[index] = request
+            self.last_used[index] = request.get_last_used_time()
         else:
-            for frame in self.frames:
+            for index, frame in enumerate(self.frames):
                 if frame and frame.get_page() == request.get_page():
-                    frame.set_last_used_time(request.get_last_used_time())
+                    self.last_used[index] = request.get_last_used_time()
 
         self.thrashing_step_count += 1
         if self.thrashing_step_count >= self.thrashing_min_length:
@@ -96,6 +110,5 @@ class Process:
             self.thrashing_step_count = 0
             self.thrashing_page_faults = 0
 
-        self.completed.append(request)
         if len(self.incomming) == 0:
             self.set_finished(True)
@@ -0,0 +1,163 @@
+"""
+Binary workload format.
+
+Header: magic, schema version, process and request record sizes, process and request counts,
+size of generator parameters. Header is followed by generator parameters encoded as json,
+fixed size process records and fixed size request records of all processes.
+
+python records.py processes.dump processes.bin
+"""
+
+import sys
+import json
+import mmap
+import pickle
+import struct
+
+from process import Process
+from request import Request
+
+MAGIC = b"LAB4ALLO"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHQQI")
+# page count, thrashing min length, thrashing factor, first request, request count
+PROCESS_RECORD = struct.Struct("<iidqq")
+# arrive time, page, local
+REQUEST_RECORD = struct.Struct("<qi?")
+WRITE_BATCH = 65536
+
+
+class RequestView:
+    """Read only sequence of requests of one process."""
+
+    def __init__(self, buffer, offset, count):
+        super(RequestView, self).__init__()
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+
+    @staticmethod
+    def decode(fields):
+        arrive_time, page, local = fields
+        return Request(page, arrive_time, local=local)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = index + self.count
+        if not 0 <= index < self.count:
+            raise IndexError("request record index out of range")
+        return self.decode(REQUEST_RECORD.unpack_from(self.buffer, self.offset + index * REQUEST_RECORD.size))
+
+    def __iter__(self):
+        view = memoryview(self.buffer)[self.offset:self.offset + self.count * REQUEST_RECORD.size]
+        try:
+            for fields in REQUEST_RECORD.iter_unpack(view):
+                yield self.decode(fields)
+        finally:
+            view.release()
+
+
+class ProcessRecords:
+    """Read only sequence of processes decoded lazily from memory mapped file."""
+
+    def __init__(self, filename):
+        super(ProcessRecords, self).__init__()
+        self.filename = filename
+        with open(filename, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, process_size, request_size, self.count, self.requests_count, params_size = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("{} is not a process records file".format(filename))
+        if version != VERSION or process_size != PROCESS_RECORD.size or request_size != REQUEST_RECORD.size:
+            raise ValueError("Unsupported process records version {} in {}".format(version, filename))
+
+        self.params = json.loads(self.buffer[HEADER.size:HEADER.size + params_size].decode("utf-8"))
+        self.offset = HEADER.size + params_size
+        self.requests_offset = self.offset + self.count * PROCESS_RECORD.size
+
+    def requests(self, index) -> RequestView:
+        _, _, _, first_request, requests_count = self.unpack(index)
+        return RequestView(self.buffer, self.requests_offset + first_request * REQUEST_RECORD.size, requests_count)
+
+    def unpack(self, index):
+        if index < 0:
+            index = index + self.count
+        if not 0 <= index < self.count:
+            raise IndexError("process record index out of range")
+        return PROCESS_RECORD.unpack_from(self.buffer, self.offset + index * PROCESS_RECORD.size)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        page_count, thrashing_min_length, thrashing_factor, _, _ = self.unpack(index)
+        return Process(self.requests(index), page_count, thrashing_min_length, thrashing_factor)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def __reduce__(self):
+        return self.__class__, (self.filename,)
+
+    def close(self):
+        self.buffer.close()
+
+
+def write_records(filename, processes, params=None) -> int:
+    """Writes processes which were not run yet."""
+    processes = list(processes)
+    return write_stream(filename, len(processes),
+                        ((proc.get_page_count(), proc.thrashing_min_length, proc.thrashing_factor, proc.incomming)
+                         for proc in processes), params)
+
+
+def write_stream(filename, count, processes, params=None) -> int:
+    """Writes count processes given as (page count, thrashing min length, thrashing factor, requests).
+    Requests of every process may be any iterable, they are written as they come.
+    Process table and request count are filled in after the last request."""
+    params = json.dumps(params or {}).encode("utf-8")
+    table = bytearray()
+    requests_count = 0
+    with open(filename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, PROCESS_RECORD.size, REQUEST_RECORD.size, count, 0, len(params)))
+        file.write(params)
+        file.write(bytes(count * PROCESS_RECORD.size))
+
+        batch = bytearray()
+        for page_count, thrashing_min_length, thrashing_factor, requests in processes:
+            first_request = requests_count
+            for req in requests:
+                batch += REQUEST_RECORD.pack(req.get_arrive_time(), req.get_page(), req.is_local())
+                requests_count = requests_count + 1
+                if requests_count % WRITE_BATCH == 0:
+                    file.write(batch)
+                    batch.clear()
+            table += PROCESS_RECORD.pack(page_count, thrashing_min_length, thrashing_factor,
+                                         first_request, requests_count - first_request)
+        file.write(batch)
+
+        if len(table) != count * PROCESS_RECORD.size:
+            raise ValueError("Expected {} processes, got {}".format(count, len(table) // PROCESS_RECORD.size))
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, PROCESS_RECORD.size, REQUEST_RECORD.size,
+                               count, requests_count, len(params)))
+        file.seek(HEADER.size + len(params))
+        file.write(table)
+    return requests_count
+
+
+def convert_pickle(pickle_filename, binary_filename, params=None) -> int:
+    """Converts pickled list of processes to binary records."""
+    with open(pickle_filename, "rb") as file:
+        processes = pickle.load(file)
+    return write_records(binary_filename, processes, params)
+
+
+if __name__ == '__main__':
+    print("Converted {} requests".format(convert_pickle(sys.argv[1], sys.argv[2])))